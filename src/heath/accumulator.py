@@ -0,0 +1,92 @@
+import datetime
+import math
+from collections import Counter
+from typing import Optional
+
+
+class Accumulator:
+    """Statistics of samples of whole seconds, gathered in one pass and
+    mergeable with the statistics of other samples.
+
+    The mean and variance are updated with Welford's algorithm. Quantiles are
+    read from a histogram of the samples, which stays small since the samples
+    are times of day or durations of at most a day.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        # Sum of squared differences from the mean.
+        self._m2 = 0.0
+        self.histogram = Counter()
+
+    def add(self, seconds: int):
+        self.count += 1
+        delta = seconds - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (seconds - self.mean)
+        self.histogram[seconds] += 1
+
+    def merge(self, other: "Accumulator"):
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta**2 * self.count * other.count / count
+        self.count = count
+        self.histogram.update(other.histogram)
+
+    @property
+    def standard_deviation(self) -> float:
+        return math.sqrt(self._m2 / (self.count - 1))
+
+    def quantile(self, fraction: float) -> float:
+        """Interpolated between the closest samples, so the 0.5 quantile is
+        the median."""
+        position = fraction * (self.count - 1)
+        index = math.floor(position)
+        lower = self._sample(index)
+        upper = self._sample(min(index + 1, self.count - 1))
+        return lower + (upper - lower) * (position - index)
+
+    def _sample(self, index: int) -> int:
+        # The sample at index if the samples were sorted.
+        seen = 0
+        for seconds in sorted(self.histogram):
+            seen += self.histogram[seconds]
+            if seen > index:
+                return seconds
+
+    def summary(self) -> tuple[Optional[datetime.timedelta], ...]:
+        """Mean, median, standard deviation and the 10th and 90th percentile,
+        if there are at least two samples."""
+        if self.count < 2:
+            return None, None, None, None, None
+        return tuple(
+            datetime.timedelta(seconds=seconds)
+            for seconds in (
+                self.mean,
+                self.quantile(0.5),
+                self.standard_deviation,
+                self.quantile(0.1),
+                self.quantile(0.9),
+            )
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Accumulator":
+        accumulator = cls()
+        accumulator.count = data["count"]
+        accumulator.mean = data["mean"]
+        accumulator._m2 = data["m2"]
+        accumulator.histogram = Counter(dict(data["histogram"]))
+        return accumulator
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self._m2,
+            "histogram": list(self.histogram.items()),
+        }
@@ -0,0 +1,94 @@
+import datetime
+
+from heath.day import Day
+from heath.day_index import DayIndex, DayRange
+from heath.work_calendar import WORK_DAY_HOURS
+
+_EXPECTED_SECONDS = WORK_DAY_HOURS // datetime.timedelta(seconds=1)
+
+
+class BalanceIndex:
+    """Cumulative worked and expected seconds of the days in a day index, so
+    the totals of any range of days are the difference of two entries.
+
+    Entry i of each list is the sum over the days before position i. The sums
+    are brought up to date from the first changed day when next read.
+    """
+
+    def __init__(self, day_index: DayIndex):
+        self._day_index = day_index
+        self._version = day_index.version
+        self._changes = Day.changes
+        # The day totals the sums were made from, to find days with new shifts.
+        self._totals = []
+        self._worked = [0]
+        self._expected_worked = [0]
+        self._expected = [0]
+
+    def range(self, day_range: DayRange) -> "BalanceRange":
+        return BalanceRange(self, day_range)
+
+    def sums(self, first: int, last: int) -> tuple[int, int, int]:
+        """Worked seconds, worked seconds of completed days that are expected
+        to be worked and expected seconds, for the days first:last."""
+        self._update()
+        return (
+            self._worked[last] - self._worked[first],
+            self._expected_worked[last] - self._expected_worked[first],
+            self._expected[last] - self._expected[first],
+        )
+
+    def _update(self):
+        first = min(self._day_index.first_changed(self._version), len(self._totals))
+        if self._changes != Day.changes:
+            first = next(
+                (
+                    position
+                    for position, day in enumerate(self._day_index.days[:first])
+                    if day.totals is not self._totals[position]
+                ),
+                first,
+            )
+        self._version = self._day_index.version
+        self._changes = Day.changes
+        if first == len(self._totals) == len(self._day_index):
+            return
+
+        del self._totals[first:]
+        del self._worked[first + 1 :]
+        del self._expected_worked[first + 1 :]
+        del self._expected[first + 1 :]
+        worked = self._worked[-1]
+        expected_worked = self._expected_worked[-1]
+        expected = self._expected[-1]
+        for day in self._day_index.days[first:]:
+            totals = day.totals
+            seconds = totals.worked_hours // datetime.timedelta(seconds=1)
+            worked += seconds
+            if totals.completed and not totals.all_day:
+                expected_worked += seconds
+                expected += _EXPECTED_SECONDS
+            self._totals.append(totals)
+            self._worked.append(worked)
+            self._expected_worked.append(expected_worked)
+            self._expected.append(expected)
+
+
+class BalanceRange:
+    """Worked hours and balance sums of a range of days of a balance index."""
+
+    def __init__(self, balance_index: BalanceIndex, day_range: DayRange):
+        self._balance_index = balance_index
+        self._day_range = day_range
+
+    def worked_hours(self) -> datetime.timedelta:
+        worked, _, _ = self._balance_index.sums(*self._day_range.positions)
+        return datetime.timedelta(seconds=worked)
+
+    def balance_sums(
+        self,
+    ) -> tuple[datetime.timedelta, datetime.timedelta, datetime.timedelta]:
+        return tuple(
+            datetime.timedelta(seconds=seconds)
+            for seconds in self._balance_index.sums(*self._day_range.positions)
+        )
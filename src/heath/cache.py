@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+from typing import Optional
+
+from heath.folder import CacheFile, MonthFile
+from heath.ledger import PARALLEL_PARSE_THRESHOLD, DayRecord, parse_month_strings
+from heath.rollup import ROLLUP_VERSION, MonthRollup
+
+CACHE_VERSION = 1
+
+
+class LedgerCache:
+    def __init__(self, cache_file: CacheFile):
+        self._cache_file = cache_file
+        self._entries = None
+        self._modified = False
+        self.hits = 0
+        self.misses = 0
+        # Hash of what rollups depend on besides the month file, see
+        # use_rollup_context.
+        self._rollup_context = ""
+
+    @property
+    def entries(self) -> dict[str, dict]:
+        if self._entries is None:
+            self._entries = self._read_entries()
+        return self._entries
+
+    def _read_entries(self) -> dict[str, dict]:
+        if not self._cache_file:
+            return {}
+        try:
+            cache_data = json.loads(self._cache_file.content)
+        except ValueError:
+            return {}
+        if cache_data.get("version") != CACHE_VERSION:
+            return {}
+        return cache_data.get("months", {})
+
+    def month_records(self, month_file: MonthFile) -> list[DayRecord]:
+        self.refresh([month_file])
+        return self.entries[month_file.key]["days"]
+
+    def refresh(
+        self,
+        month_files: list[MonthFile],
+        workers: int = 1,
+        threshold: int = PARALLEL_PARSE_THRESHOLD,
+    ) -> None:
+        stale_months = []
+        for month_file in month_files:
+            stat = month_file.path.stat()
+            entry = self.entries.get(month_file.key)
+            if entry and _same_stat(entry, stat):
+                self.hits += 1
+                continue
+
+            content = month_file.content
+            content_hash = _content_hash(content)
+            if entry and entry["hash"] == content_hash:
+                # Same content with a new timestamp, e.g. after a git checkout.
+                entry["mtime"] = stat.st_mtime_ns
+                self._modified = True
+                self.hits += 1
+                continue
+
+            stale_months.append((month_file.key, stat, content, content_hash))
+
+        parsed_months = parse_month_strings(
+            [content for _, _, content, _ in stale_months],
+            workers=workers,
+            threshold=threshold,
+        )
+        for (key, stat, _, content_hash), day_records in zip(
+            stale_months, parsed_months
+        ):
+            self.entries[key] = {
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "hash": content_hash,
+                "days": day_records,
+            }
+            self._modified = True
+            self.misses += 1
+
+    def use_rollup_context(self, *contents: str) -> None:
+        """Rollups are only used with the contents they were made with, e.g.
+        of the projects and year files."""
+        self._rollup_context = _content_hash("\0".join(contents))
+
+    def month_rollup(self, month_file: MonthFile) -> Optional[MonthRollup]:
+        # Rollups are stored with the days of a month, which are replaced
+        # when the content of the month file changes.
+        entry = self.entries.get(month_file.key)
+        if not entry or not _same_stat(entry, month_file.path.stat()):
+            return None
+        rollup = entry.get("rollup")
+        if (
+            not rollup
+            or rollup.get("version") != ROLLUP_VERSION
+            or rollup["context"] != self._rollup_context
+        ):
+            return None
+        return MonthRollup.from_dict(rollup)
+
+    def store_rollup(self, month_file: MonthFile, rollup: MonthRollup) -> None:
+        if entry := self.entries.get(month_file.key):
+            entry["rollup"] = {"context": self._rollup_context, **rollup.to_dict()}
+            self._modified = True
+
+    @property
+    def rollup_count(self) -> int:
+        return sum(
+            entry.get("rollup", {}).get("context") == self._rollup_context
+            for entry in self.entries.values()
+        )
+
+    def is_valid(self, month_file: MonthFile) -> bool:
+        if not (entry := self.entries.get(month_file.key)):
+            return False
+        return _same_stat(entry, month_file.path.stat()) or (
+            entry["hash"] == _content_hash(month_file.content)
+        )
+
+    def save(self) -> None:
+        if not self._modified:
+            return
+        cache_string = json.dumps(
+            {"version": CACHE_VERSION, "months": self.entries}, separators=(",", ":")
+        )
+        try:
+            self._cache_file.write(cache_string)
+        except OSError:
+            # The cache is only an optimization, a read only ledger still works.
+            return
+        self._modified = False
+
+    def clear(self) -> None:
+        self._cache_file.remove()
+        self._entries = {}
+        self._modified = False
+
+    @property
+    def size(self) -> Optional[int]:
+        return self._cache_file.path.stat().st_size if self._cache_file else None
+
+
+def _same_stat(entry: dict, stat: os.stat_result) -> bool:
+    return (entry["mtime"], entry["size"]) == (stat.st_mtime_ns, stat.st_size)
+
+
+def _content_hash(content: str) -> str:
+    return hashlib.sha1(content.encode()).hexdigest()
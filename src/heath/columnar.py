@@ -0,0 +1,93 @@
+import datetime
+from typing import Callable, Sequence
+
+try:
+    import numpy
+except ImportError:  # Optional dependency, see the README.
+    numpy = None
+
+from heath.day import Day
+from heath.day_index import DayRange
+from heath.project import Project
+
+# Time periods with fewer days than this are aggregated over their Day objects.
+COLUMNAR_THRESHOLD = 200
+
+
+def available() -> bool:
+    return numpy is not None
+
+
+class ColumnarDays:
+    """Columns derived from the shifts of days in date order, with one row
+    per shift and the position of its day. Shift projects are kept as ids into
+    the projects of a ledger, see Ledger.add_project. The days remain the
+    source of truth."""
+
+    def __init__(self, days: Sequence[Day], projects: Sequence[Project]):
+        shift_rows = []
+        for row, day in enumerate(days):
+            for shift in day.shifts:
+                shift_rows.append(
+                    (
+                        row,
+                        shift.project.id,
+                        shift.duration // datetime.timedelta(seconds=1),
+                        shift.all_day,
+                    )
+                )
+
+        self.projects = list(projects)
+        shift_columns = list(zip(*shift_rows)) or [()] * 4
+        self.shift_day = numpy.array(shift_columns[0], dtype=numpy.int64)
+        self.shift_project = numpy.array(shift_columns[1], dtype=numpy.int64)
+        self.shift_duration = numpy.array(shift_columns[2], dtype=numpy.int64)
+        self.shift_all_day = numpy.array(shift_columns[3], dtype=bool)
+
+
+class ColumnarSlice:
+    """Vectorized aggregates over a range of columnar days, which are built by
+    columns_factory when first needed."""
+
+    def __init__(
+        self, columns_factory: Callable[[], ColumnarDays], day_range: DayRange
+    ):
+        self._columns_factory = columns_factory
+        self._day_range = day_range
+
+    def __len__(self) -> int:
+        return len(self._day_range)
+
+    @property
+    def _columns(self) -> ColumnarDays:
+        return self._columns_factory()
+
+    def project_totals(self) -> dict[str, dict]:
+        """Hours and all day counts per project, ordered as the projects first
+        appear when each day's projects are sorted by key."""
+        columns = self._columns
+        first, last = numpy.searchsorted(columns.shift_day, self._day_range.positions)
+        day_rows = columns.shift_day[first:last]
+        project_ids = columns.shift_project[first:last]
+        all_day = columns.shift_all_day[first:last]
+        project_count = len(columns.projects)
+
+        hours = numpy.bincount(
+            project_ids,
+            weights=numpy.where(all_day, 0, columns.shift_duration[first:last]),
+            minlength=project_count,
+        )
+        days = numpy.bincount(project_ids[all_day], minlength=project_count)
+        first_rows = numpy.full(project_count, numpy.iinfo(numpy.int64).max)
+        numpy.minimum.at(first_rows, project_ids, day_rows)
+
+        # Project ids are only translated to projects for the result.
+        projects = [columns.projects[i] for i in numpy.unique(project_ids).tolist()]
+        projects.sort(key=lambda project: (first_rows[project.id], project.key))
+        return {
+            project.key: {
+                "hours": datetime.timedelta(seconds=int(hours[project.id])),
+                "days": int(days[project.id]),
+            }
+            for project in projects
+        }
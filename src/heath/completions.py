@@ -1,20 +1,196 @@
+import datetime
+import json
 import os
 from pathlib import Path
+from typing import Optional
 
+from heath.folder import FileObject, LedgerFolder, MonthFile
 from heath.project import Project
 
 
+class CompletionIndex:
+    def __init__(self, folder_path: Path):
+        self._folder = LedgerFolder(folder_path)
+        self._index_file = self._folder.completion_index
+        self._index = None
+        self._modified = False
+
+    @property
+    def index(self) -> dict:
+        if self._index is None:
+            try:
+                self._index = json.loads(self._index_file.content)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    @property
+    def projects(self) -> list[tuple[str, bool]]:
+        projects_file = self._folder.projects
+        entry = self.index.get("projects")
+        stat = _stat(projects_file)
+        if not entry or entry["stat"] != stat:
+            projects = (
+                Project.from_configuration_path(projects_file.path)
+                if projects_file
+                else []
+            )
+            entry = {
+                "stat": stat,
+                "keys": [(project.key, bool(project.all_day)) for project in projects],
+            }
+            self.index["projects"] = entry
+            self._modified = True
+        return entry["keys"]
+
+    @property
+    def dates(self) -> list[datetime.date]:
+        """Dates with data in any month file."""
+        cached_months = self.index.get("months", {})
+        month_files = self._folder.ordered_months
+        months = {}
+        for month_file in month_files:
+            entry = cached_months.get(month_file.key)
+            stat = _stat(month_file)
+            if not entry or entry["stat"] != stat:
+                entry = {"stat": stat, "days": _day_numbers(month_file)}
+                self._modified = True
+            months[month_file.key] = entry
+
+        if months.keys() != cached_months.keys():
+            self._modified = True
+        self.index["months"] = months
+
+        return [
+            datetime.date(month_file.year, month_file.month, day_number)
+            for month_file in month_files
+            for day_number in months[month_file.key]["days"]
+        ]
+
+    def save(self):
+        if self._modified:
+            try:
+                self._index_file.write(json.dumps(self.index, separators=(",", ":")))
+            except OSError:
+                return
+            self._modified = False
+
+
+def _stat(file: FileObject) -> Optional[list[int]]:
+    if not file:
+        return None
+    stat = file.path.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _day_numbers(month_file: MonthFile) -> list[int]:
+    day_numbers = []
+    for line in month_file.lines():
+        day_number, dot, _ = line.partition(".")
+        if dot and day_number.isdecimal():
+            day_numbers.append(int(day_number))
+    return day_numbers
+
+
+def _completion_index(ctx) -> Optional[CompletionIndex]:
+    if heath_folder := (
+        ctx.find_root().params.get("folder") or os.environ.get("HEATH_FOLDER")
+    ):
+        return CompletionIndex(Path(heath_folder))
+    return None
+
+
+def _complete_numbers(numbers, incomplete: str) -> list[str]:
+    return [
+        str(number)
+        for number in sorted(set(numbers))
+        if str(number).startswith(incomplete)
+    ]
+
+
+def _complete_dates(ctx, complete):
+    # Runs complete with the dates of the ledger and saves any index updates.
+    if completion_index := _completion_index(ctx):
+        completions = complete(completion_index.dates)
+        completion_index.save()
+        return completions
+    return []
+
+
 def complete_projects(ctx, param, incomplete: str, all_day: bool = False):
-    if heath_folder := os.environ.get("HEATH_FOLDER"):
-        projects_file = Path(heath_folder) / "projects.cfg"
-        projects = Project.from_configuration_path(projects_file)
+    if completion_index := _completion_index(ctx):
+        projects = completion_index.projects
+        completion_index.save()
         return [
-            project.key
-            for project in projects
-            if project.key.lower().startswith(incomplete.lower()) and project.all_day == all_day
+            project_key
+            for project_key, project_all_day in projects
+            if project_key.lower().startswith(incomplete.lower())
+            and project_all_day == all_day
         ]
     return []
 
 
 def complete_allday_projects(ctx, param, incomplete):
     return complete_projects(ctx, param, incomplete, all_day=True)
+
+
+def complete_day_numbers(ctx, param, incomplete: str):
+    today = datetime.date.today()
+    return _complete_dates(
+        ctx,
+        lambda dates: _complete_numbers(
+            (
+                date.day
+                for date in dates
+                if (date.year, date.month) == (today.year, today.month)
+            ),
+            incomplete,
+        ),
+    )
+
+
+def complete_month_numbers(ctx, param, incomplete: str):
+    day_number = ctx.params.get("day_number")
+    return _complete_dates(
+        ctx,
+        lambda dates: _complete_numbers(
+            (date.month for date in dates if day_number in (None, date.day)),
+            incomplete,
+        ),
+    )
+
+
+def complete_week_numbers(ctx, param, incomplete: str):
+    return _complete_dates(
+        ctx,
+        lambda dates: _complete_numbers(
+            (date.isocalendar().week for date in dates), incomplete
+        ),
+    )
+
+
+def complete_years(ctx, param, incomplete: str):
+    day_number = ctx.params.get("day_number")
+    month_number = ctx.params.get("month_number")
+    return _complete_dates(
+        ctx,
+        lambda dates: _complete_numbers(
+            (
+                date.year
+                for date in dates
+                if day_number in (None, date.day) and month_number in (None, date.month)
+            ),
+            incomplete,
+        ),
+    )
+
+
+def complete_dates(ctx, param, incomplete: str):
+    return _complete_dates(
+        ctx,
+        lambda dates: [
+            date.isoformat()
+            for date in dates
+            if date.isoformat().startswith(incomplete)
+        ],
+    )
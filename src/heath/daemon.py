@@ -0,0 +1,211 @@
+import contextlib
+import io
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Only the standard library is imported at module level, so forwarding a
+# command to a running daemon does not pay for importing click, git etc.
+
+SOCKET_NAME = "heath.sock"
+
+# Commands that need a terminal, or run git, are always run in process.
+IN_PROCESS_COMMANDS = {"serve", "edit", "push", "pull", "projects add"}
+
+# Commands that may change the ledger in memory. The resident ledger is
+# reopened after them, so dry runs and failed commands leave no traces.
+MUTATING_COMMANDS = {"start", "lunch", "stop", "switch", "allday", "comment", "cache"}
+
+# Options of the command group that take a value.
+GROUP_VALUE_OPTIONS = {"-f", "--folder", "-j", "--workers"}
+
+
+def main():
+    args = sys.argv[1:]
+    # Shell completion is run by click in process, with arguments in the env.
+    completing = "_HEATH_COMPLETE" in os.environ
+    if not completing and (exit_code := forward(args, _folder_path(args))) is not None:
+        sys.exit(exit_code)
+
+    from heath.heath import main as heath_main
+
+    heath_main()
+
+
+def socket_path(folder_path: Path) -> Path:
+    return folder_path / ".heath-cache" / SOCKET_NAME
+
+
+def forward(args: list[str], folder_path: Path) -> Optional[int]:
+    """Run a command in a running daemon. Returns None if there is none."""
+    path = socket_path(folder_path)
+    if _is_command(args, IN_PROCESS_COMMANDS) or not path.exists():
+        return None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(str(path))
+        except OSError:
+            # A socket left behind by a daemon that is no longer running.
+            return None
+        _send(connection, {"args": args})
+        response = _receive(connection)
+
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["exit_code"]
+
+
+def _folder_path(args: list[str]) -> Path:
+    for index, arg in enumerate(args):
+        if arg in ("-f", "--folder") and index + 1 < len(args):
+            return Path(args[index + 1])
+        if arg.startswith("--folder="):
+            return Path(arg.split("=", 1)[1])
+    return Path(os.environ.get("HEATH_FOLDER") or Path.cwd())
+
+
+def _is_command(args: list[str], commands: set[str]) -> bool:
+    # Commands are matched by name, or by group and name, and not by any
+    # other arguments, such as the text of a comment.
+    command = _command(args)
+    return bool(command) and (
+        command[0] in commands or " ".join(command[:2]) in commands
+    )
+
+
+def _command(args: list[str]) -> list[str]:
+    """The command of args and the arguments after it, without the options of
+    the command group."""
+    index = 0
+    while index < len(args) and args[index].startswith("-"):
+        index += 2 if args[index] in GROUP_VALUE_OPTIONS else 1
+    return args[index:]
+
+
+def _send(connection: socket.socket, message: dict):
+    connection.sendall(json.dumps(message).encode())
+    connection.shutdown(socket.SHUT_WR)
+
+
+def _receive(connection: socket.socket) -> dict:
+    with connection.makefile("rb") as stream:
+        return json.loads(stream.read())
+
+
+class LedgerDaemon:
+    def __init__(self, folder_path: Path, workers: int = 1):
+        self.folder_path = folder_path
+        self.workers = workers
+        self.socket_path = socket_path(folder_path)
+        self._server = None
+        self._open()
+
+    def _open(self):
+        from heath.heath import open_ledger
+
+        self.state = open_ledger(self.folder_path, self.workers)
+        self._file_stats = self._read_file_stats()
+
+    def _read_file_stats(self) -> dict[Path, tuple[int, int]]:
+        from heath.folder import LedgerFolder
+
+        ledger_folder = LedgerFolder(self.folder_path)
+        files = [
+            *ledger_folder.months.values(),
+            *ledger_folder.years,
+            ledger_folder.projects,
+            ledger_folder.config,
+        ]
+        return {
+            file.path: (stat.st_mtime_ns, stat.st_size)
+            for file in files
+            if file
+            for stat in (file.path.stat(),)
+        }
+
+    def refresh(self):
+        """Reload the months whose files have changed on disk."""
+        from heath.folder import LedgerFolder, MonthFile
+        from heath.heath import register_month_file
+
+        file_stats = self._read_file_stats()
+        changed_paths = {
+            path
+            for path in file_stats.keys() | self._file_stats.keys()
+            if file_stats.get(path) != self._file_stats.get(path)
+        }
+        if not changed_paths:
+            return
+        if not all(MonthFile.PATTERN.match(path.name) for path in changed_paths):
+            # Projects, configuration and non working dates concern all months.
+            self._open()
+            return
+
+        ledger = self.state["LEDGER"]
+        self.state["FOLDER"] = LedgerFolder(self.folder_path)
+        for path in changed_paths:
+            month_file = MonthFile(path)
+            ledger.forget_month(month_file.year, month_file.month)
+            if month_file:
+                register_month_file(ledger, self.state["CACHE"], month_file)
+        self._file_stats = file_stats
+
+    def handle(self, args: list[str]) -> dict:
+        from heath.heath import run
+
+        self.refresh()
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                run(args, self.state)
+                exit_code = 0
+            except SystemExit as e:
+                if isinstance(e.code, str):
+                    print(e.code, file=sys.stderr)
+                    exit_code = 1
+                else:
+                    exit_code = e.code or 0
+
+        self.state["CACHE"].save()
+        if _is_command(args, MUTATING_COMMANDS):
+            self._open()
+        return {
+            "exit_code": exit_code,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+        }
+
+    def listen(self):
+        self.socket_path.parent.mkdir(exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(str(self.socket_path))
+        self._server.listen()
+
+    def serve(self):
+        if not self._server:
+            self.listen()
+        try:
+            while True:
+                connection, _ = self._server.accept()
+                with connection:
+                    try:
+                        response = self.handle(_receive(connection)["args"])
+                    except Exception as e:
+                        # A failed request, e.g. a file removed while the
+                        # ledger was refreshed, must not stop the daemon.
+                        response = {
+                            "exit_code": 1,
+                            "stdout": "",
+                            "stderr": "Unexpected error! Contemplate the "
+                            f'following internal error:\n"{e}"\n',
+                        }
+                    with contextlib.suppress(OSError):
+                        connection.sendall(json.dumps(response).encode())
+        finally:
+            self._server.close()
+            self.socket_path.unlink(missing_ok=True)
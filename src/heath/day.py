@@ -1,3 +1,4 @@
+import bisect
 from collections import defaultdict
 import datetime
 from typing import Optional
@@ -11,7 +12,53 @@ from heath.time_utils import pretty_duration, pretty_time
 tabulate.PRESERVE_WHITESPACE = True
 
 
+def _now_by_the_minute() -> datetime.datetime:
+    return datetime.datetime.now().replace(second=0, microsecond=0)
+
+
+class _DayTotals:
+    """Aggregates over the shifts of a day, computed in one pass."""
+
+    __slots__ = (
+        "worked_hours",
+        "lunch",
+        "projects",
+        "project_durations",
+        "open_shifts",
+        "all_day",
+        "completed",
+    )
+
+    def __init__(self, shifts: list[Shift]):
+        self.worked_hours = datetime.timedelta()
+        self.lunch = datetime.timedelta()
+        projects = {}
+        # Durations of completed shifts per project key, None for all day.
+        self.project_durations = {}
+        self.open_shifts = []
+        for shift in shifts:
+            self.lunch += shift.lunch_duration
+            projects.setdefault(shift.project.key, shift.project)
+            if not shift.completed:
+                self.open_shifts.append(shift)
+            elif shift.all_day:
+                self.project_durations[shift.project.key] = None
+            else:
+                self.worked_hours += shift.duration
+                self.project_durations[shift.project.key] = (
+                    self.project_durations.get(shift.project.key, datetime.timedelta())
+                    + shift.duration
+                )
+        self.projects = list(projects.values())
+        self.all_day = len(shifts) == 1 and shifts[0].all_day
+        self.completed = self.all_day or bool(shifts) and not self.open_shifts
+
+
 class Day:
+    # Number of changes to the shifts of any day, so data derived from many
+    # days can tell when it is stale.
+    changes = 0
+
     def __init__(
         self, date: datetime.date, comment: str = None, non_working_day: bool = False
     ):
@@ -19,7 +66,13 @@ class Day:
             raise DayError("A date must be given.")
         self.date = date
         self.comment = comment
+        # Shifts are kept sorted by start, also when added out of order.
         self._shifts = []
+        # Start and stop of the completed shifts, sorted by start, except for
+        # the shifts in _unindexed_shifts.
+        self._intervals: list[tuple[datetime.datetime, datetime.datetime]] = []
+        self._unindexed_shifts: list[Shift] = []
+        self._totals: Optional[_DayTotals] = None
         self.non_working_day = non_working_day
 
     def __str__(self):
@@ -34,10 +87,9 @@ class Day:
 
     @property
     def current_shift(self) -> Optional[Shift]:
-        if self.shifts:
-            last_shift = self.shifts[-1]
-            if last_shift.started and not last_shift.completed:
-                return last_shift
+        for shift in self.totals.open_shifts:
+            if shift.started:
+                return shift
         return None
 
     @property
@@ -48,23 +100,27 @@ class Day:
     def stop_time(self) -> datetime.datetime:
         return self.shifts[-1].stop_time
 
+    @property
+    def totals(self) -> _DayTotals:
+        if self._totals is None:
+            self._totals = _DayTotals(self._shifts)
+        return self._totals
+
+    def shift_changed(self):
+        self._totals = None
+        Day.changes += 1
+
     @property
     def lunch(self) -> datetime.timedelta:
-        return sum(
-            (shift.lunch_duration for shift in self.shifts), datetime.timedelta()
-        )
+        return self.totals.lunch
 
     @property
     def worked_hours(self) -> datetime.timedelta:
-        return sum(
-            (shift.duration for shift in self.shifts), start=datetime.timedelta()
-        )
+        return self.totals.worked_hours
 
     @property
     def projects(self):
-        return list(
-            {shift.project.key: shift.project for shift in self.shifts}.values()
-        )
+        return self.totals.projects
 
     @property
     def all_day_project_name(self):
@@ -72,25 +128,19 @@ class Day:
 
     @property
     def all_day(self) -> bool:
-        return len(self.shifts) == 1 and self.shifts[0].all_day
+        return self.totals.all_day
 
     @property
     def completed(self):
-        return self.all_day or (
-            self.shifts and all(shift.completed for shift in self.shifts)
-        )
+        return self.totals.completed
 
-    def current_duration(self):
-        now_by_the_minute = datetime.datetime.now().replace(second=0, microsecond=0)
-        return self.duration_at(now_by_the_minute)
+    def current_duration(self, read_time: Optional[datetime.datetime] = None):
+        return self.duration_at(read_time or _now_by_the_minute())
 
     def duration_at(self, read_time: datetime.datetime) -> datetime.timedelta:
         return sum(
-            (
-                shift.duration if shift.completed else shift.duration_at(read_time)
-                for shift in self.shifts
-            ),
-            start=datetime.timedelta(),
+            (shift.duration_at(read_time) for shift in self.totals.open_shifts),
+            start=self.totals.worked_hours,
         )
 
     def add_shift(self, shift: Shift):
@@ -105,7 +155,13 @@ class Day:
                 )
         else:
             self._shift_consistency_check(shift)
-        self._shifts.append(shift)
+        if shift.started:
+            bisect.insort_right(self._shifts, shift, key=lambda s: s.start_time)
+        else:
+            self._shifts.append(shift)
+        self._unindexed_shifts.append(shift)
+        shift.day = self
+        self.shift_changed()
 
     def report(
         self,
@@ -167,31 +223,36 @@ class Day:
 
         return report_string
 
-    def report_data_by_project(self, include_active_shift: bool = False):
+    def report_data_by_project(
+        self,
+        include_active_shift: bool = False,
+        read_time: Optional[datetime.datetime] = None,
+    ):
         projects = defaultdict(lambda: {"hours": datetime.timedelta(), "days": 0})
 
-        for shift in self.shifts:
-            if shift.all_day:
-                projects[shift.project.key]["days"] += 1
-            elif include_active_shift:
-                projects[shift.project.key]["hours"] += shift.current_duration
+        for project_key, duration in self.totals.project_durations.items():
+            if duration is None:
+                projects[project_key]["days"] += 1
             else:
-                projects[shift.project.key]["hours"] += shift.duration
+                projects[project_key]["hours"] += duration
+        for shift in self.totals.open_shifts:
+            projects[shift.project.key]["hours"] += (
+                shift.duration_at(read_time or _now_by_the_minute())
+                if include_active_shift
+                else datetime.timedelta()
+            )
         return sorted((project, duration) for project, duration in projects.items())
 
-    def project_durations(self, include_active_shifts: bool = False):
-        now_by_the_minute = datetime.datetime.now().replace(second=0, microsecond=0)
-        projects = defaultdict(datetime.timedelta)
-        for shift in [
-            shift for shift in self.shifts if shift.completed or include_active_shifts
-        ]:
-            if shift.all_day:
-                projects[shift.project.key] = None
-            else:
-                projects[shift.project.key] += (
-                    shift.duration
-                    if shift.completed or not include_active_shifts
-                    else shift.duration_at(now_by_the_minute)
+    def project_durations(
+        self,
+        include_active_shifts: bool = False,
+        read_time: Optional[datetime.datetime] = None,
+    ):
+        projects = defaultdict(datetime.timedelta, self.totals.project_durations)
+        if include_active_shifts:
+            for shift in self.totals.open_shifts:
+                projects[shift.project.key] += shift.duration_at(
+                    read_time or _now_by_the_minute()
                 )
         return projects
 
@@ -266,18 +327,31 @@ class Day:
         )
 
     def _shift_consistency_check(self, shift: Shift):
-        # (StartA <= EndB) and (EndA >= StartB)
-        for existing_shift in self.shifts:
+        # Only the last added shift can be open, so it is indexed once completed.
+        for existing_shift in self._unindexed_shifts:
             if not existing_shift.completed:
                 raise DateInconsistencyError("Previous shift not completed.")
+            if existing_shift.all_day:
+                raise DayInconsistencyError("Shifts can't be added to all day shifts.")
+            bisect.insort_right(
+                self._intervals, (existing_shift.start_time, existing_shift.stop_time)
+            )
+        self._unindexed_shifts.clear()
+
+        if not shift.completed:
+            return
 
-            if (
-                shift.completed
-                and (existing_shift.start_time < shift.stop_time)
-                and (existing_shift.stop_time > shift.start_time)
-            ):
+        # The completed shifts don't overlap, so sorted by start they are sorted
+        # by stop as well, and only the neighbours of the new shift can overlap.
+        index = bisect.bisect_right(
+            self._intervals, (shift.start_time, shift.stop_time)
+        )
+        neighbours = self._intervals[max(index - 1, 0) : index + 1]
+        for start_time, stop_time in neighbours:
+            # (StartA <= EndB) and (EndA >= StartB)
+            if start_time < shift.stop_time and stop_time > shift.start_time:
                 raise DayInconsistencyError(
                     "Added shift overlaps with a previous shift "
                     f"({shift.start_time}-{shift.stop_time}, "
-                    f"{existing_shift.start_time}-{existing_shift.stop_time}"
+                    f"{start_time}-{stop_time}"
                 )
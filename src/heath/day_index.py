@@ -0,0 +1,149 @@
+import bisect
+import datetime
+from collections.abc import Sequence
+from typing import Iterable, Iterator, Optional
+
+from heath.day import Day
+
+
+class DayView(Sequence):
+    """The days in days[start:stop], without copying them.
+
+    A view is only valid until days are inserted into or removed from the
+    underlying list.
+    """
+
+    __slots__ = ("_days", "_start", "_stop")
+
+    def __init__(self, days: list[Day], start: int = 0, stop: Optional[int] = None):
+        self._days = days
+        self._start = start
+        self._stop = len(days) if stop is None else stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        positions = range(self._start, self._stop)[index]
+        if isinstance(index, slice):
+            if positions.step == 1:
+                return DayView(self._days, positions.start, positions.stop)
+            return [self._days[position] for position in positions]
+        return self._days[positions]
+
+    def __iter__(self) -> Iterator[Day]:
+        return map(self._days.__getitem__, range(self._start, self._stop))
+
+    def __reversed__(self) -> Iterator[Day]:
+        return map(self._days.__getitem__, reversed(range(self._start, self._stop)))
+
+    def __repr__(self) -> str:
+        return f"DayView({list(self)!r})"
+
+
+class DayRange(Sequence):
+    """The days of a day index between two dates, without copying them.
+
+    Unlike a view, a range stays valid when days are inserted into or removed
+    from the index, since its positions are then bisected again.
+    """
+
+    __slots__ = ("_day_index", "first_date", "last_date", "_version", "_positions")
+
+    def __init__(
+        self, day_index: "DayIndex", first_date: datetime.date, last_date: datetime.date
+    ):
+        self._day_index = day_index
+        self.first_date = first_date
+        self.last_date = last_date
+        self._version = None
+        self._positions = (0, 0)
+
+    @property
+    def positions(self) -> tuple[int, int]:
+        """The current positions first:last of the days in the index."""
+        if self._version != self._day_index.version:
+            self._positions = self._day_index.positions(self.first_date, self.last_date)
+            self._version = self._day_index.version
+        return self._positions
+
+    @property
+    def _view(self) -> DayView:
+        return DayView(self._day_index._days, *self.positions)
+
+    def __len__(self) -> int:
+        first, last = self.positions
+        return last - first
+
+    def __getitem__(self, index):
+        return self._view[index]
+
+    def __iter__(self) -> Iterator[Day]:
+        return iter(self._view)
+
+    def __reversed__(self) -> Iterator[Day]:
+        return reversed(self._view)
+
+    def __repr__(self) -> str:
+        return f"DayRange({list(self)!r})"
+
+
+class DayIndex:
+    """Days in date order, with the ordinals of their dates for bisection."""
+
+    def __init__(self):
+        self._ordinals: list[int] = []
+        self._days: list[Day] = []
+        # Incremented on every insert and remove.
+        self.version = 0
+        # The first position changed by each version.
+        self._changed_positions: list[int] = []
+
+    @property
+    def days(self) -> DayView:
+        return DayView(self._days)
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def insert(self, days: Iterable[Day]):
+        first_changed = len(self._days)
+        for day in days:
+            ordinal = day.date.toordinal()
+            if not self._ordinals or ordinal >= self._ordinals[-1]:
+                self._ordinals.append(ordinal)
+                self._days.append(day)
+            else:
+                position = bisect.bisect_right(self._ordinals, ordinal)
+                self._ordinals.insert(position, ordinal)
+                self._days.insert(position, day)
+                first_changed = min(first_changed, position)
+        self._changed(first_changed)
+
+    def remove(self, first_date: datetime.date, last_date: datetime.date):
+        first, last = self.positions(first_date, last_date)
+        del self._ordinals[first:last]
+        del self._days[first:last]
+        self._changed(first)
+
+    def first_changed(self, version: int) -> int:
+        """The first position changed since version. Days before it are unchanged."""
+        return min(self._changed_positions[version:], default=len(self._days))
+
+    def _changed(self, position: int):
+        self.version += 1
+        self._changed_positions.append(position)
+
+    def view(self, first_date: datetime.date, last_date: datetime.date) -> DayView:
+        return DayView(self._days, *self.positions(first_date, last_date))
+
+    def range(self, first_date: datetime.date, last_date: datetime.date) -> DayRange:
+        return DayRange(self, first_date, last_date)
+
+    def positions(
+        self, first_date: datetime.date, last_date: datetime.date
+    ) -> tuple[int, int]:
+        return (
+            bisect.bisect_left(self._ordinals, first_date.toordinal()),
+            bisect.bisect_right(self._ordinals, last_date.toordinal()),
+        )
@@ -1,6 +1,7 @@
+import os
 from pathlib import Path
 import re
-from typing import Optional
+from typing import Iterator, Optional
 
 
 class FileObject:
@@ -11,6 +12,10 @@ class FileObject:
     def content(self):
         return self.path.read_text()
 
+    def lines(self) -> Iterator[str]:
+        with self.path.open() as file:
+            yield from file
+
     def write(self, content: str):
         self.path.write_text(content)
 
@@ -40,6 +45,27 @@ class MonthFile(FileObject):
             return int(match.group(2))
         return None
 
+    def last_line(self) -> tuple[int, str]:
+        """Byte offset and text of the last non blank line, read from the end."""
+        with self.path.open("rb") as file:
+            end = file.seek(0, os.SEEK_END)
+            block_size = min(end, 1024)
+            while True:
+                file.seek(end - block_size)
+                tail = file.read(block_size).rstrip()
+                line_start = tail.rfind(b"\n") + 1
+                if line_start or block_size == end:
+                    break
+                block_size = min(end, block_size * 4)
+        return end - block_size + line_start, tail[line_start:].decode()
+
+    def write_from(self, offset: int, content: str):
+        """Replace everything from byte offset to the end of the file."""
+        with self.path.open("r+b") as file:
+            file.seek(offset)
+            file.write(content.encode())
+            file.truncate()
+
     @property
     def year(self):
         if match := MonthFile.PATTERN.match(self.path.name):
@@ -63,6 +89,18 @@ class ConfigFile(FileObject):
         self.path = folder_path / "config.cfg"
 
 
+class CacheFile(FileObject):
+    def __init__(self, folder_path: Path, name: str = "months.json"):
+        self.path = folder_path / ".heath-cache" / name
+
+    def write(self, content: str):
+        self.path.parent.mkdir(exist_ok=True)
+        super().write(content)
+
+    def remove(self):
+        self.path.unlink(missing_ok=True)
+
+
 class LedgerFolder:
     def __init__(self, folder_path: Path):
         self.path = folder_path
@@ -70,6 +108,8 @@ class LedgerFolder:
         self._years = []
         self._projects = ProjectsFile(self.path)
         self._config = ConfigFile(self.path)
+        self._cache = CacheFile(self.path)
+        self._completion_index = CacheFile(self.path, "completions.json")
 
     @property
     def valid(self) -> bool:
@@ -137,6 +177,14 @@ class LedgerFolder:
     def config(self) -> ConfigFile:
         return self._config
 
+    @property
+    def cache(self) -> CacheFile:
+        return self._cache
+
+    @property
+    def completion_index(self) -> CacheFile:
+        return self._completion_index
+
     @property
     def file_names(self) -> list[Path]:
         paths = [m.path for m in self.months.values()] + [
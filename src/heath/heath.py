@@ -1,5 +1,7 @@
 import datetime
+import functools
 import locale
+import signal
 import subprocess
 import sys
 from pathlib import Path
@@ -10,34 +12,51 @@ import git
 from tabulate import tabulate
 
 from heath import completions
+from heath.cache import LedgerCache
 from heath.config import Config
+from heath.daemon import LedgerDaemon
 from heath.day import Day
 from heath.exceptions import ProjectError
-from heath.folder import LedgerFolder
-from heath.ledger import Ledger
+from heath.folder import LedgerFolder, MonthFile
+from heath.ledger import Ledger, parse_day_string
+from heath.month import Month
 from heath.project import Project
+from heath.rollup import MonthRollup
 from heath.shift import Shift
-from heath.time_period import CustomTimePeriod
+from heath.years import YearsReport
 from heath import exceptions
 
 
 @click.group()
 @click.version_option()
 @click.option("-f", "--folder", type=Path, envvar="HEATH_FOLDER")
+@click.option(
+    "-j",
+    "--workers",
+    type=click.IntRange(1),
+    default=1,
+    envvar="HEATH_WORKERS",
+    help="Parse changed month files in parallel using this many processes.",
+)
 @click.pass_context
-def cli(ctx, folder: Path):
-    if not folder:
-        folder = Path.cwd()
+def cli(ctx, folder: Path, workers: int):
+    ctx.ensure_object(dict)
+    if "LEDGER" in ctx.obj:
+        # A resident ledger served by 'heath serve'.
+        return
+
+    ctx.obj.update(open_ledger(folder or Path.cwd(), workers))
+    ctx.call_on_close(ctx.obj["CACHE"].save)
+
+
+def open_ledger(folder: Path, workers: int = 1) -> dict:
     ledger_folder = LedgerFolder(folder)
 
     if not ledger_folder.valid:
         sys.exit("Ledger folder not valid")
 
     ledger = Ledger()
-    ctx.ensure_object(dict)
-    ctx.obj["LEDGER"] = ledger
-    ctx.obj["FOLDER"] = ledger_folder
-    ctx.obj["CONFIG"] = Config(ledger_folder.config.path)
+    ledger_cache = LedgerCache(ledger_folder.cache)
 
     if ledger_folder.projects:
         ledger.parse_projects(ledger_folder.projects.content)
@@ -45,15 +64,42 @@ def cli(ctx, folder: Path):
     for year_file in ledger_folder.years:
         ledger.parse_year(year_file.year, year_file.content)
 
+    # Rollups depend on the projects and the non working dates as well.
+    ledger_cache.use_rollup_context(
+        ledger_folder.projects.content if ledger_folder.projects else "",
+        *(year_file.path.name + year_file.content for year_file in ledger_folder.years),
+    )
+
+    if workers > 1:
+        ledger_cache.refresh(ledger_folder.ordered_months, workers=workers)
+
     for month_file in ledger_folder.ordered_months:
-        try:
-            ledger.parse_month(month_file.year, month_file.month, month_file.content)
-        except exceptions.HeathError as e:
-            raise exceptions.HeathError(f"Could not parse exising ledger. {e}")
-    
+        register_month_file(ledger, ledger_cache, month_file)
+
+    return {
+        "LEDGER": ledger,
+        "FOLDER": ledger_folder,
+        "CONFIG": Config(ledger_folder.config.path),
+        "CACHE": ledger_cache,
+        "WORKERS": workers,
+    }
+
+
+def register_month_file(
+    ledger: Ledger, ledger_cache: LedgerCache, month_file: MonthFile
+):
+    ledger.register_month(
+        month_file.year,
+        month_file.month,
+        functools.partial(_load_month_file, ledger, ledger_cache, month_file),
+        functools.partial(ledger_cache.month_rollup, month_file),
+    )
+
 
 @cli.command(help="Show ledger for year.")
-@click.argument("year", type=int, required=False)
+@click.argument(
+    "year", type=int, required=False, shell_complete=completions.complete_years
+)
 @click.option(
     "-a",
     "--include_active_day",
@@ -71,8 +117,16 @@ def cli(ctx, folder: Path):
     "-r",
     "--round-durations",
     is_flag=True,
-    help="Round project durations to nearest half hours if possible."
-    "Total duration will remain unaffected.",
+    help="Round project durations to the rounding granularity. Day totals and "
+    "the total duration are kept, or rounded if they are not multiples of it.",
+)
+@click.option(
+    "-g",
+    "--granularity",
+    type=click.IntRange(1, 24 * 60),
+    default=30,
+    show_default=True,
+    help="Rounding granularity in minutes.",
 )
 @click.option("-s", "--stats", is_flag=True, help="Show statistics.")
 @click.option("-o", "--overview", is_flag=True, help="Brief overview of year.")
@@ -84,6 +138,7 @@ def year(
     by_project: bool,
     by_project_total: bool,
     round_durations: bool,
+    granularity: int,
     stats: bool,
     overview: bool,
 ):
@@ -101,13 +156,66 @@ def year(
             by_project=by_project,
             by_project_total=by_project_total,
             round_project_durations=round_durations,
+            rounding_granularity=datetime.timedelta(minutes=granularity),
         )
     print("\n" + report + "\n")
 
 
+@cli.command(help="Show totals per year.")
+@click.argument(
+    "first_year", type=int, required=False, shell_complete=completions.complete_years
+)
+@click.argument(
+    "last_year", type=int, required=False, shell_complete=completions.complete_years
+)
+@click.option(
+    "-P",
+    "--by-project-total",
+    is_flag=True,
+    help="Group by project for each year.",
+)
+@click.option("-s", "--stats", is_flag=True, help="Show statistics for each year.")
+@click.pass_context
+def years(
+    ctx,
+    first_year: Optional[int],
+    last_year: Optional[int],
+    by_project_total: bool,
+    stats: bool,
+):
+    ledger: Ledger = ctx.obj["LEDGER"]
+
+    first_year = first_year or min(ledger.years, default=datetime.date.today().year)
+    last_year = last_year or max(ledger.years, default=first_year)
+    year_numbers = [year for year in ledger.years if first_year <= year <= last_year]
+    if not year_numbers:
+        sys.exit(f"No data for {first_year} - {last_year}.")
+
+    total = ledger.get_custom_time_period(
+        datetime.date(first_year, 1, 1), datetime.date(last_year, 12, 31)
+    )
+    total.title = "Totalt"
+    years_report = YearsReport([ledger.get_year(year) for year in year_numbers], total)
+
+    if stats:
+        report = years_report.statistics_report()
+    elif by_project_total:
+        report = years_report.project_report()
+    else:
+        report = years_report.report()
+    print("\n" + report + "\n")
+
+
 @cli.command(help="Show ledger for month.")
-@click.argument("month_number", type=click.IntRange(1, 12), required=False)
-@click.argument("year", type=int, required=False)
+@click.argument(
+    "month_number",
+    type=click.IntRange(1, 12),
+    required=False,
+    shell_complete=completions.complete_month_numbers,
+)
+@click.argument(
+    "year", type=int, required=False, shell_complete=completions.complete_years
+)
 @click.option(
     "-a",
     "--include_active_day",
@@ -128,8 +236,16 @@ def year(
     "-r",
     "--round-durations",
     is_flag=True,
-    help="Round project durations to nearest half hours if possible."
-    "Total duration will remain unaffected.",
+    help="Round project durations to the rounding granularity. Day totals and "
+    "the total duration are kept, or rounded if they are not multiples of it.",
+)
+@click.option(
+    "-g",
+    "--granularity",
+    type=click.IntRange(1, 24 * 60),
+    default=30,
+    show_default=True,
+    help="Rounding granularity in minutes.",
 )
 @click.option("-s", "--stats", is_flag=True, help="Show statistics.")
 @click.option("-o", "--overview", is_flag=True, help="Brief overview of month.")
@@ -143,6 +259,7 @@ def month(
     by_project: bool,
     by_project_total: bool,
     round_durations: bool,
+    granularity: int,
     stats: bool,
     overview: bool,
 ):
@@ -163,13 +280,14 @@ def month(
             by_project=by_project,
             by_project_total=by_project_total,
             round_project_durations=round_durations,
+            rounding_granularity=datetime.timedelta(minutes=granularity),
         )
     print("\n" + report + "\n")
 
 
 @cli.command(help="Show ledger for custom interval.")
-@click.argument("start_date", type=str)
-@click.argument("end_date", type=str)
+@click.argument("start_date", type=str, shell_complete=completions.complete_dates)
+@click.argument("end_date", type=str, shell_complete=completions.complete_dates)
 @click.option(
     "-a",
     "--include_active_day",
@@ -190,8 +308,16 @@ def month(
     "-r",
     "--round-durations",
     is_flag=True,
-    help="Round project durations to nearest half hours if possible."
-    "Total duration will remain unaffected.",
+    help="Round project durations to the rounding granularity. Day totals and "
+    "the total duration are kept, or rounded if they are not multiples of it.",
+)
+@click.option(
+    "-g",
+    "--granularity",
+    type=click.IntRange(1, 24 * 60),
+    default=30,
+    show_default=True,
+    help="Rounding granularity in minutes.",
 )
 @click.option("-s", "--stats", is_flag=True, help="Show statistics.")
 @click.option("-o", "--overview", is_flag=True, help="Brief overview of interval.")
@@ -205,6 +331,7 @@ def interval(
     by_project: bool,
     by_project_total: bool,
     round_durations: bool,
+    granularity: int,
     stats: bool,
     overview: bool,
 ):
@@ -226,14 +353,22 @@ def interval(
             by_project=by_project,
             by_project_total=by_project_total,
             round_project_durations=round_durations,
+            rounding_granularity=datetime.timedelta(minutes=granularity),
         )
 
     print("\n" + report + "\n")
 
 
 @cli.command(help="Show ledger for week.")
-@click.argument("week_number", type=click.IntRange(0, 53), required=False)
-@click.argument("year", type=int, required=False)
+@click.argument(
+    "week_number",
+    type=click.IntRange(1, 53),
+    required=False,
+    shell_complete=completions.complete_week_numbers,
+)
+@click.argument(
+    "year", type=int, required=False, shell_complete=completions.complete_years
+)
 @click.option(
     "-a",
     "--include_active_day",
@@ -254,8 +389,16 @@ def interval(
     "-r",
     "--round-durations",
     is_flag=True,
-    help="Round project durations to nearest half hours if possible."
-    "Total duration will remain unaffected.",
+    help="Round project durations to the rounding granularity. Day totals and "
+    "the total duration are kept, or rounded if they are not multiples of it.",
+)
+@click.option(
+    "-g",
+    "--granularity",
+    type=click.IntRange(1, 24 * 60),
+    default=30,
+    show_default=True,
+    help="Rounding granularity in minutes.",
 )
 @click.option("-s", "--stats", is_flag=True, help="Show statistics.")
 @click.option("-o", "--overview", is_flag=True, help="Brief overview of week.")
@@ -269,6 +412,7 @@ def week(
     by_project: bool,
     by_project_total: bool,
     round_durations: bool,
+    granularity: int,
     stats: bool,
     overview: bool,
 ):
@@ -291,15 +435,28 @@ def week(
             by_project=by_project,
             by_project_total=by_project_total,
             round_project_durations=round_durations,
+            rounding_granularity=datetime.timedelta(minutes=granularity),
         )
 
     print("\n" + report + "\n")
 
 
 @cli.command(help="Show ledger for day.")
-@click.argument("day_number", type=click.IntRange(1, 31), required=False)
-@click.argument("month_number", type=click.IntRange(1, 12), required=False)
-@click.argument("year_number", type=int, required=False)
+@click.argument(
+    "day_number",
+    type=click.IntRange(1, 31),
+    required=False,
+    shell_complete=completions.complete_day_numbers,
+)
+@click.argument(
+    "month_number",
+    type=click.IntRange(1, 12),
+    required=False,
+    shell_complete=completions.complete_month_numbers,
+)
+@click.argument(
+    "year_number", type=int, required=False, shell_complete=completions.complete_years
+)
 @click.option(
     "-a",
     "--include_active_shift",
@@ -330,15 +487,9 @@ def day(
         else ledger.today
     ):
         if overview:
-            week_year, week_number, _ = day_ledger.date.isocalendar()
-            days_in_week = [
-                d
-                for d in ledger.get_week(week_number, week_year).all_days
-                if d.date <= day_ledger.date
-            ]
-            partial_week = CustomTimePeriod(
-                days_in_week[0].date, days_in_week[-1].date, days_in_week
-            )
+            day_date = day_ledger.date
+            monday = day_date - datetime.timedelta(days=day_date.weekday())
+            partial_week = ledger.get_custom_time_period(monday, day_date)
             day_string = day_ledger.overview(week_balance=partial_week.balance)
         else:
             day_string = day_ledger.report(
@@ -434,7 +585,11 @@ def start(
 
     if not dry_run:
         _write_month_to_disk(
-            ledger, folder, ledger.current_month.year, ledger.current_month.month
+            ledger,
+            folder,
+            ledger.current_month.year,
+            ledger.current_month.month,
+            changed_day=ledger.last_day,
         )
 
     if verbose:
@@ -462,7 +617,11 @@ def lunch(ctx, lunch_duration: str, dry_run: bool, verbose: bool):
 
     if not dry_run:
         _write_month_to_disk(
-            ledger, folder, ledger.current_month.year, ledger.current_month.month
+            ledger,
+            folder,
+            ledger.current_month.year,
+            ledger.current_month.month,
+            changed_day=ledger.last_day,
         )
 
     if verbose:
@@ -492,7 +651,11 @@ def stop(ctx, stop_time: str, dry_run: bool, verbose: bool):
 
     if not dry_run:
         _write_month_to_disk(
-            ledger, folder, ledger.current_month.year, ledger.current_month.month
+            ledger,
+            folder,
+            ledger.current_month.year,
+            ledger.current_month.month,
+            changed_day=ledger.last_day,
         )
 
     if verbose:
@@ -531,7 +694,11 @@ def switch(ctx, project: str, start_time: str, dry_run: bool, verbose: bool):
 
     if not dry_run:
         _write_month_to_disk(
-            ledger, folder, ledger.current_month.year, ledger.current_month.month
+            ledger,
+            folder,
+            ledger.current_month.year,
+            ledger.current_month.month,
+            changed_day=ledger.last_day,
         )
 
     if verbose:
@@ -581,7 +748,11 @@ def allday(
 
     if not dry_run:
         _write_month_to_disk(
-            ledger, folder, ledger.current_month.year, ledger.current_month.month
+            ledger,
+            folder,
+            ledger.current_month.year,
+            ledger.current_month.month,
+            changed_day=ledger.last_day,
         )
 
     if verbose:
@@ -629,15 +800,24 @@ def comment(
         day.comment = comment_string
 
         if not dry_run:
-            _write_month_to_disk(ledger, folder, day.date.year, day.date.month)
+            _write_month_to_disk(
+                ledger, folder, day.date.year, day.date.month, changed_day=day
+            )
 
         if verbose:
             print("\n" + ledger.last_day.report(include_comments=True) + "\n")
 
 
 @cli.command(help="Edit month file in external editor.")
-@click.argument("month_number", type=click.IntRange(1, 12), required=False)
-@click.argument("year", type=int, required=False)
+@click.argument(
+    "month_number",
+    type=click.IntRange(1, 12),
+    required=False,
+    shell_complete=completions.complete_month_numbers,
+)
+@click.argument(
+    "year", type=int, required=False, shell_complete=completions.complete_years
+)
 @click.pass_context
 def edit(
     ctx,
@@ -661,6 +841,54 @@ def edit(
         sys.exit(f"Ledger has no month file for {month_description}.")
 
 
+@cli.group(help="Handle cache of parsed month files.")
+@click.pass_context
+def cache(ctx):
+    pass
+
+
+@cache.command("clear", help="Remove all cached month data.")
+@click.pass_context
+def cache_clear(ctx):
+    folder: LedgerFolder = ctx.obj["FOLDER"]
+    ledger_cache: LedgerCache = ctx.obj["CACHE"]
+    ledger_cache.clear()
+    folder.completion_index.remove()
+
+
+@cache.command("rebuild", help="Parse all month files and cache the result.")
+@click.pass_context
+def cache_rebuild(ctx):
+    folder: LedgerFolder = ctx.obj["FOLDER"]
+    ledger_cache: LedgerCache = ctx.obj["CACHE"]
+
+    ledger_cache.clear()
+    ledger_cache.refresh(folder.ordered_months, workers=ctx.obj["WORKERS"])
+    print(f"Cached {len(ledger_cache.entries)} months.")
+
+
+@cache.command("stats", help="Show cache statistics.")
+@click.pass_context
+def cache_stats(ctx):
+    folder: LedgerFolder = ctx.obj["FOLDER"]
+    ledger_cache: LedgerCache = ctx.obj["CACHE"]
+
+    valid_months = [
+        month_file
+        for month_file in folder.ordered_months
+        if ledger_cache.is_valid(month_file)
+    ]
+    strings = (
+        f"Path: {folder.cache}",
+        f"Months: {len(folder.months)}",
+        f"Cached: {len(valid_months)}",
+        f"Stale: {len(ledger_cache.entries) - len(valid_months)}",
+        f"Rollups: {ledger_cache.rollup_count}",
+        f"Size: {ledger_cache.size or 0} bytes",
+    )
+    print("\n".join(strings))
+
+
 @cli.command(help="Commit edits to ledger repo.")
 @click.option("-m", "--commit-message", type=str, required=False)
 @click.pass_context
@@ -747,28 +975,89 @@ def _input_until(
     return value
 
 
+def _load_month_file(ledger: Ledger, ledger_cache: LedgerCache, month_file: MonthFile):
+    try:
+        ledger.load_month(
+            month_file.year, month_file.month, ledger_cache.month_records(month_file)
+        )
+    except exceptions.HeathError as e:
+        raise exceptions.HeathError(f"Could not parse exising ledger. {e}")
+
+    if not ledger_cache.month_rollup(month_file):
+        month = ledger.get_month(month_file.month, month_file.year)
+        if rollup := MonthRollup.from_month(month):
+            ledger_cache.store_rollup(month_file, rollup)
+
+
 def _write_month_to_disk(
-    ledger: Ledger, folder: LedgerFolder, year: int, month_number: int
+    ledger: Ledger,
+    folder: LedgerFolder,
+    year: int,
+    month_number: int,
+    changed_day: Optional[Day] = None,
 ):
     month = ledger.get_month(month_number, year)
 
-    serialized_month = month.serialize()
-    if month_file := folder.months.get(ledger.current_month.key):
+    if month_file := folder.months.get(month.key):
+        if changed_day is month.last_day and _patch_last_day(month, month_file):
+            return
+        serialized_month = month.serialize()
         if serialized_month != month_file.content:
             month_file.write(serialized_month)
     else:
-        folder.next_month.write(serialized_month)
+        folder.next_month.write(month.serialize())
 
 
-def main():
-    locale.setlocale(locale.LC_TIME, "")
+def _patch_last_day(month: Month, month_file: MonthFile) -> bool:
+    # Rewrite only the last day line of the file, or append a line for a new
+    # last day, as long as the rest of the file still matches the month.
+    offset, last_line = month_file.last_line()
+    last_record = parse_day_string(last_line)
+    last_day_string = str(month.last_day)
+
+    if last_record and last_record[0] == month.last_day.date.day:
+        if last_line != last_day_string:
+            month_file.write_from(offset, last_day_string + "\n")
+        return True
+
+    previous_day = month.days[-2] if len(month.days) > 1 else None
+    if previous_day and last_record == parse_day_string(str(previous_day)):
+        month_file.write_from(offset, f"{last_line}\n{last_day_string}\n")
+        return True
+    if not previous_day and not last_line:
+        month_file.write_from(0, last_day_string + "\n")
+        return True
+    return False
+
+
+@cli.command(help="Serve commands from a resident ledger over a unix socket.")
+@click.pass_context
+def serve(ctx):
+    folder: LedgerFolder = ctx.obj["FOLDER"]
+
+    ledger_daemon = LedgerDaemon(folder.path, workers=ctx.obj["WORKERS"])
+    print(f"Serving {folder.path.absolute()} on {ledger_daemon.socket_path}")
+    # Exit through SystemExit on SIGTERM so the socket is removed.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit())
     try:
-        cli(obj={})
+        ledger_daemon.serve()
+    except KeyboardInterrupt:
+        pass
+
+
+def run(args: Optional[list[str]] = None, obj: Optional[dict] = None):
+    try:
+        cli(args=args, prog_name="heath", obj=obj if obj is not None else {})
     except exceptions.HeathError as e:
         print(e)
     except Exception as e:
         print(f"Unexpected error! Contemplate the following internal error:\n\"{e}\"")
 
 
+def main():
+    locale.setlocale(locale.LC_TIME, "")
+    run()
+
+
 if __name__ == "__main__":
     main()
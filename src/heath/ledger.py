@@ -1,12 +1,22 @@
+from concurrent.futures import ProcessPoolExecutor
+import bisect
+import calendar
+import functools
 import re
 import datetime
+import weakref
+from typing import Callable, Iterable, Iterator, Optional
 
-from heath import exceptions
+from heath import columnar, exceptions
+from heath.balance_index import BalanceIndex
 from heath.day import Day
+from heath.day_index import DayIndex
 from heath.month import Month
 from heath.project import Project
+from heath.rollup import MonthRollup
 from heath.shift import Shift
 from heath.time_period import CustomTimePeriod
+from heath.work_calendar import WorkCalendar
 
 COMMENT_PATTERN = re.compile("#.*")
 DAY_PATTERN = re.compile("(\d+)\.\s*(.+)?")
@@ -15,15 +25,44 @@ SHIFT_PATTERN = re.compile(
     flags=re.IGNORECASE,
 )
 
+# Fewer month strings than this are always parsed in the current process.
+PARALLEL_PARSE_THRESHOLD = 24
+
+# (project key, start minutes, stop minutes, lunch minutes)
+ShiftRecord = tuple[str, Optional[int], Optional[int], Optional[int]]
+# (day number, comment, shift records)
+DayRecord = tuple[int, Optional[str], list[ShiftRecord]]
+
 
 class Ledger:
     def __init__(self) -> None:
+        # Loaded months, always in chronological order, and indexed by
+        # (year, month).
         self._months = []
+        self._month_index = {}
+        # The days of all loaded months in date order. Time periods are
+        # views into these.
+        self._work_days = DayIndex()
+        self._balance_index = BalanceIndex(self._work_days)
+        self._all_days = DayIndex()
+        self._columns = None
+        self._columns_version = None
+        self._pending_months = {}
+        # Functions giving rollups of pending months, if they have any.
+        self._month_rollups = {}
+        # Time periods with rollups, which are dropped when their months load.
+        self._rolled_up_periods = weakref.WeakSet()
         self._projects = {}
+        # Projects by their dense ids. Projects with the same key share an id.
+        self._project_ids: dict[str, int] = {}
+        self._projects_by_id: list[Project] = []
         self._non_working_dates = {}
+        self._work_calendars = {}
 
     @property
     def months(self) -> list[Month]:
+        for year, month in sorted(self._pending_months):
+            self._load_month(year, month)
         return self._months
 
     @property
@@ -37,12 +76,17 @@ class Ledger:
 
     @property
     def current_month(self) -> Month:
-        return self.months[-1]
+        if self._pending_months:
+            last_pending = max(self._pending_months)
+            last_loaded = self._month_tuple(self._months[-1]) if self._months else None
+            if last_loaded is None or last_pending > last_loaded:
+                self._load_month(*last_pending)
+        return self._months[-1]
 
     @property
     def current_week(self) -> CustomTimePeriod:
-        today = datetime.date.today()
-        return self.get_week(today.isocalendar().week, today.year)
+        iso_date = datetime.date.today().isocalendar()
+        return self.get_week(iso_date.week, iso_date.year)
 
     @property
     def last_day(self) -> Day:
@@ -65,11 +109,16 @@ class Ledger:
         next_month = self.current_month.month + 1
         next_month_year = self.current_month.year + (next_month > 12)
         next_month = (next_month - 1) % 12 + 1
-        temporary_month = Month(next_month_year, next_month)
-        for date, desciption in self.non_working_dates.get(next_month_year, {}).items():
-            if date.month == next_month:
-                temporary_month.add_non_working_date(date, desciption)
-        return temporary_month.next_work_date
+        first_date = datetime.date(next_month_year, next_month, 1)
+        return self.work_calendar(next_month_year).next_work_date(first_date)
+
+    def work_calendar(self, year: int) -> WorkCalendar:
+        # Shared by all months of the year.
+        if year not in self._work_calendars:
+            self._work_calendars[year] = WorkCalendar(
+                year, self._non_working_dates.get(year, {})
+            )
+        return self._work_calendars[year]
 
     def get_day(self, day_number, month_number=None, year=None) -> Day:
         month = self.get_month(month_number, year)
@@ -77,26 +126,24 @@ class Ledger:
 
     def get_week(self, week_number, year=None) -> CustomTimePeriod:
         year = year or datetime.date.today().year
-        week_string = f"{year}-{week_number:02}"
-        monday = datetime.datetime.strptime(f"{week_string}-1", "%Y-%W-%u")
-        sunday = datetime.datetime.strptime(f"{week_string}-7", "%Y-%W-%u")
+        try:
+            monday = datetime.date.fromisocalendar(year, week_number, 1)
+        except ValueError:
+            raise exceptions.DateInconsistencyError(
+                f"Year {year} has no week {week_number}."
+            )
+        sunday = monday + datetime.timedelta(days=6)
 
         title = f"Vecka {week_number}, {year}"
 
-        return CustomTimePeriod(
-            monday.date(),
-            sunday.date(),
-            [day for month in self.months for day in month.all_days],
-            title=title,
-        )
+        return self._time_period(monday, sunday, title)
 
     def get_custom_time_period(
         self, start_date: datetime.date, end_date: datetime.date
     ):
-        return CustomTimePeriod(
+        return self._time_period(
             start_date,
             end_date,
-            [day for month in self.months for day in month.all_days],
             title=f"{start_date.isoformat()} - {end_date.isoformat()}",
         )
 
@@ -104,12 +151,15 @@ class Ledger:
         year = year or datetime.date.today().year
         month_number = month_number or datetime.date.today().month
 
-        month = [
-            month
-            for month in self.months
-            if month.year == year and month.month == month_number
-        ]
-        return month[0] if month else None
+        if (year, month_number) in self._pending_months:
+            self._load_month(year, month_number)
+
+        return self._month_index.get((year, month_number))
+
+    @property
+    def years(self) -> list[int]:
+        """The years with loaded or pending months."""
+        return sorted({year for year, _ in (*self._month_index, *self._pending_months)})
 
     def get_year(self, year) -> CustomTimePeriod | None:
         year = year or datetime.date.today().year
@@ -117,12 +167,80 @@ class Ledger:
         new_years_day = datetime.date(year, 1, 1)
         new_years_eve = datetime.date(year, 12, 31)
 
-        return CustomTimePeriod(
-            new_years_day,
-            new_years_eve,
-            [day for month in self.months for day in month.all_days],
+        return self._time_period(new_years_day, new_years_eve, title)
+
+    def _time_period(
+        self,
+        first_date: datetime.date,
+        last_date: datetime.date,
+        title: str,
+        use_rollups: bool = True,
+    ) -> CustomTimePeriod:
+        first_month = (first_date.year, first_date.month)
+        last_month = (last_date.year, last_date.month)
+        rollups = []
+        for year, month in sorted(self._pending_months):
+            if not first_month <= (year, month) <= last_month:
+                continue
+            # Pending months that are wholly in the period may be left unloaded
+            # if they have a rollup.
+            month_first_date = datetime.date(year, month, 1)
+            month_last_date = month_first_date.replace(
+                day=calendar.monthrange(year, month)[1]
+            )
+            rollup = (
+                use_rollups
+                and first_date <= month_first_date
+                and month_last_date <= last_date
+                and (month_rollup := self._month_rollups.get((year, month)))
+                and month_rollup()
+            )
+            if rollup:
+                rollups.append(rollup)
+            else:
+                self._load_month(year, month)
+        # Ranges, since loading earlier months moves the positions of the days.
+        work_days = self._work_days.range(first_date, last_date)
+        time_period = CustomTimePeriod.from_views(
+            first_date,
+            last_date,
+            work_days,
+            self._all_days.range(first_date, last_date),
             title=title,
+            sums=self._balance_index.range(work_days),
+            rollups=rollups,
+            load_rolled_up_months=(
+                functools.partial(
+                    self._time_period, first_date, last_date, title, False
+                )
+                if rollups
+                else None
+            ),
+            columns=(
+                columnar.ColumnarSlice(self._columnar_days, work_days)
+                if columnar.available()
+                and len(work_days) >= columnar.COLUMNAR_THRESHOLD
+                else None
+            ),
         )
+        if rollups:
+            self._rolled_up_periods.add(time_period)
+        return time_period
+
+    def _columnar_days(self) -> "columnar.ColumnarDays":
+        # Rebuilt from the days whenever days or shifts have changed.
+        version = (self._work_days.version, Day.changes)
+        if self._columns is None or self._columns_version != version:
+            self._columns = columnar.ColumnarDays(
+                self._work_days.days, self._projects_by_id
+            )
+            self._columns_version = version
+        return self._columns
+
+    def _index_days(self, days: Iterable[Day]):
+        days = list(days)
+        self._work_days.insert(day for day in days if not day.non_working_day)
+        self._all_days.insert(days)
 
     @property
     def non_working_dates(self) -> dict[int, dict[datetime.date, str]]:
@@ -130,59 +248,132 @@ class Ledger:
 
     def add_day(self, new_day: Day):
         if new_day.date.month != self.current_month.month:
-            self.add_month(Month(new_day.date.year, new_day.date.month))
-        first_day = len(self.months) == 1 and not self.current_month.days
+            year = new_day.date.year
+            self.add_month(Month(year, new_day.date.month, self.work_calendar(year)))
+        first_day = (
+            len(self._months) + len(self._pending_months) == 1
+            and not self.current_month.days
+        )
         self.current_month.add_day(new_day, allow_late_start=first_day)
+        self._index_days([new_day])
 
     def add_month(self, month: Month):
         for date, desciption in self.non_working_dates.get(month.year, {}).items():
             if date.month == month.month:
                 month.add_non_working_date(date, desciption)
-        self._months.append(month)
-        self._months.sort(key=lambda m: f"{m.year}{m.month:02}")
+        bisect.insort_right(self._months, month, key=self._month_tuple)
+        self._month_index.setdefault(self._month_tuple(month), month)
+        self._index_days(month.all_days)
+
+    def register_month(
+        self,
+        year: int,
+        month: int,
+        loader: Callable[[], None],
+        rollup: Optional[Callable[[], Optional[MonthRollup]]] = None,
+    ):
+        # The loader is called once, when the month is first needed, and is
+        # expected to add the month to the ledger (e.g. through parse_month).
+        # Until then, time periods may use the rollup of the month instead,
+        # if the rollup function gives one.
+        self._pending_months[(year, month)] = loader
+        if rollup:
+            self._month_rollups[(year, month)] = rollup
+
+    def forget_month(self, year: int, month: int):
+        month_tuple = (year, month)
+        self._pending_months.pop(month_tuple, None)
+        self._month_rollups.pop(month_tuple, None)
+        if self._month_index.pop(month_tuple, None):
+            months = self._months
+            first = bisect.bisect_left(months, month_tuple, key=self._month_tuple)
+            last = bisect.bisect_right(months, month_tuple, key=self._month_tuple)
+            del months[first:last]
+
+            first_date = datetime.date(year, month, 1)
+            last_date = first_date.replace(day=calendar.monthrange(year, month)[1])
+            self._work_days.remove(first_date, last_date)
+            self._all_days.remove(first_date, last_date)
+
+    def _load_month(self, year: int, month: int):
+        self._month_rollups.pop((year, month), None)
+        if loader := self._pending_months.pop((year, month), None):
+            loader()
+            # The ranges of time periods now include the days of the month.
+            for time_period in self._rolled_up_periods:
+                time_period.drop_rollup(year, month)
+
+    @staticmethod
+    def _month_tuple(month: Month) -> tuple[int, int]:
+        return month.year, month.month
+
+    def _is_first_month(self, month: Month) -> bool:
+        month_tuple = self._month_tuple(month)
+        return month_tuple <= self._month_tuple(self._months[0]) and all(
+            month_tuple <= pending for pending in self._pending_months
+        )
 
     def add_non_working_date(self, date: datetime.date, description: str):
-        for month in self.months:
-            if (month.year, month.month) == (date.year, date.month):
-                raise exceptions.MonthDateInconsistencyError(
-                    "Month for non working date already added to ledger. "
-                    f"{date}: {description}"
-                )
+        if (date.year, date.month) in self._pending_months:
+            raise exceptions.MonthDateInconsistencyError(
+                "Month for non working date already registered in ledger. "
+                f"{date}: {description}"
+            )
+        if (date.year, date.month) in self._month_index:
+            raise exceptions.MonthDateInconsistencyError(
+                "Month for non working date already added to ledger. "
+                f"{date}: {description}"
+            )
 
         if date.year not in self._non_working_dates:
             self._non_working_dates[date.year] = {}
         self._non_working_dates[date.year][date] = description
-
-    def add_project(self, project: Project):
+        if date.year in self._work_calendars:
+            self._work_calendars[date.year].add_non_working_date(date)
+
+    def add_project(self, project: Project) -> Project:
+        """Registers the project and returns it, or an equal project that is
+        already registered. Projects get dense ids in the order their keys are
+        first added, and projects with the same key share an id."""
+        project.id = self._project_ids.setdefault(project.key, len(self._project_ids))
+        if project.id == len(self._projects_by_id):
+            self._projects_by_id.append(project)
+        elif self._projects_by_id[project.id] == project:
+            return self._projects_by_id[project.id]
+        else:
+            self._projects_by_id[project.id] = project
         self._projects[project.key] = project
+        return project
+
+    @property
+    def projects_by_id(self) -> list[Project]:
+        return self._projects_by_id
 
     def parse_day(self, year: int, month: int, day_string: str) -> None:
-        day_components = day_string.split("#", 1)
-        day_data = day_components[0]
-        day_comment = day_components[1].strip() if len(day_components) == 2 else None
+        if day_record := parse_day_string(day_string):
+            self.add_day(self._day_from_record(year, month, day_record))
 
-        if day_match := DAY_PATTERN.match(day_data):
-            date = datetime.date(year, month, int(day_match.group(1)))
+    def _day_from_record(self, year: int, month: int, day_record: DayRecord) -> Day:
+        day_number, day_comment, shift_records = day_record
+        date = datetime.date(year, month, day_number)
 
-            day = Day(date, day_comment)
-            for shift_matches in SHIFT_PATTERN.findall(day_match.group(2) or ""):
-                (project_key, start_time, stop_time, lunch_duration) = shift_matches
-                project = self.get_project(project_key)
-                shift = Shift(project, date)
-                if start_time:
-                    time = datetime.time(*map(int, start_time.split(":")))
-                    shift.start(datetime.datetime.combine(date, time))
+        day = Day(date, day_comment)
+        for project_key, start_minutes, stop_minutes, lunch_minutes in shift_records:
+            project = self.get_project(project_key)
+            shift = Shift(project, date)
+            if start_minutes is not None:
+                time = datetime.time(*divmod(start_minutes, 60))
+                shift.start(datetime.datetime.combine(date, time))
 
-                if stop_time:
-                    time = datetime.time(*map(int, stop_time.split(":")))
-                    shift.stop(datetime.datetime.combine(date, time))
+            if stop_minutes is not None:
+                time = datetime.time(*divmod(stop_minutes, 60))
+                shift.stop(datetime.datetime.combine(date, time))
 
-                if lunch_duration:
-                    hours, minutes = map(int, lunch_duration.split(":"))
-                    shift.lunch(datetime.timedelta(hours=hours, minutes=minutes))
+            if lunch_minutes is not None:
+                shift.lunch(datetime.timedelta(minutes=lunch_minutes))
 
-                day.add_shift(shift)
-            self.add_day(day)
+            day.add_shift(shift)
+        return day
 
     def get_project(self, project_key: str, all_day=False):
         try:
@@ -197,11 +388,28 @@ class Ledger:
         return project
 
     def parse_month(self, year, month, month_string: str) -> None:
-        new_month = Month(year, month)
+        self.load_month(year, month, parse_month_string(month_string))
+
+    def load_month(self, year: int, month: int, day_records: list[DayRecord]):
+        new_month = Month(year, month, self.work_calendar(year))
         self.add_month(new_month)
+        allow_late_start = self._is_first_month(new_month)
+
+        for day_record in day_records:
+            new_month.add_day(
+                self._day_from_record(year, month, day_record),
+                allow_late_start=allow_late_start,
+            )
+        self._index_days(new_month.days)
 
-        for day_string in month_string.splitlines():
-            self.parse_day(year, month, day_string)
+    def stream_month(
+        self, year: int, month: int, month_lines: Iterable[str]
+    ) -> Iterator[Day]:
+        # Days are yielded one line at a time without being added to any
+        # month, so no Month consistency checks are made.
+        for day_string in month_lines:
+            if day_record := parse_day_string(day_string.rstrip("\r\n")):
+                yield self._day_from_record(year, month, day_record)
 
     def parse_year(self, year: int, year_string: str) -> None:
         year_string_without_comments = COMMENT_PATTERN.sub("", year_string)
@@ -231,3 +439,132 @@ class Ledger:
         return Project.to_configuration_string(
             sorted(self.projects.values(), key=lambda k: k.key)
         )
+
+
+def parse_month_string(month_string: str) -> list[DayRecord]:
+    return [
+        day_record
+        for day_string in month_string.splitlines()
+        if (day_record := parse_day_string(day_string))
+    ]
+
+
+def parse_month_strings(
+    month_strings: list[str],
+    workers: int = 1,
+    threshold: int = PARALLEL_PARSE_THRESHOLD,
+) -> list[list[DayRecord]]:
+    if workers > 1 and len(month_strings) >= max(threshold, 2):
+        chunk_size = max(1, len(month_strings) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(
+                executor.map(parse_month_string, month_strings, chunksize=chunk_size)
+            )
+    return [parse_month_string(month_string) for month_string in month_strings]
+
+
+def parse_day_string(day_string: str) -> Optional[DayRecord]:
+    # Tokenizes the grammar "N. KEY HH:MM - HH:MM, Lunch H:MM; ... # comment"
+    # with string methods. Anything not on that form is left to the regex
+    # based reference implementation, which defines the full grammar.
+    day_data, comment_separator, day_comment = day_string.partition("#")
+    day_number, dot, shifts_string = day_data.partition(".")
+    if not (dot and day_number.isdecimal()):
+        return None
+    if "\n" in shifts_string:
+        return parse_day_string_with_regex(day_string)
+
+    shift_records = []
+    for shift_string in shifts_string.split(";"):
+        if not shift_string or shift_string.isspace():
+            continue
+        if (shift_record := _tokenize_shift(shift_string)) is None:
+            return parse_day_string_with_regex(day_string)
+        shift_records.append(shift_record)
+
+    day_comment = day_comment.strip() if comment_separator else None
+    return int(day_number), day_comment, shift_records
+
+
+def _tokenize_shift(shift_string: str) -> Optional[ShiftRecord]:
+    times_string, _, lunch_string = shift_string.partition(",")
+    key_and_times = times_string.split(None, 1)
+    if not key_and_times or not _is_word(project_key := key_and_times[0]):
+        return None
+
+    start_minutes = stop_minutes = lunch_minutes = None
+    if len(key_and_times) == 2:
+        start_string, dash, stop_string = key_and_times[1].partition("-")
+        if (start_minutes := _clock_minutes(start_string.strip())) is None:
+            return None
+        if dash and (stop_string := stop_string.strip()):
+            if (stop_minutes := _clock_minutes(stop_string)) is None:
+                return None
+
+    if lunch_string := lunch_string.strip():
+        if start_minutes is None or lunch_string[:5].lower() != "lunch":
+            return None
+        if lunch_string := lunch_string[5:].lstrip():
+            if (lunch_minutes := _duration_minutes(lunch_string)) is None:
+                return None
+
+    return project_key, start_minutes, stop_minutes, lunch_minutes
+
+
+def _is_word(string: str) -> bool:
+    return string.isalnum() or all(c.isalnum() or c == "_" for c in string)
+
+
+def _duration_minutes(duration_string: str) -> Optional[int]:
+    hours, colon, minutes = duration_string.partition(":")
+    if colon and hours.isdecimal() and minutes.isdecimal():
+        return int(hours) * 60 + int(minutes)
+    return None
+
+
+def _clock_minutes(time_string: str) -> Optional[int]:
+    # Out of range clock times are left for the reference parser to reject.
+    hours, colon, minutes = time_string.partition(":")
+    if colon and hours.isdecimal() and minutes.isdecimal():
+        hours, minutes = int(hours), int(minutes)
+        if hours < 24 and minutes < 60:
+            return hours * 60 + minutes
+    return None
+
+
+def parse_day_string_with_regex(day_string: str) -> Optional[DayRecord]:
+    day_components = day_string.split("#", 1)
+    day_data = day_components[0]
+    day_comment = day_components[1].strip() if len(day_components) == 2 else None
+
+    if day_match := DAY_PATTERN.match(day_data):
+        shift_records = [
+            (
+                project_key,
+                _time_to_minutes(start_time),
+                _time_to_minutes(stop_time),
+                _duration_to_minutes(lunch_duration),
+            )
+            for (
+                project_key,
+                start_time,
+                stop_time,
+                lunch_duration,
+            ) in SHIFT_PATTERN.findall(day_match.group(2) or "")
+        ]
+        return int(day_match.group(1)), day_comment, shift_records
+    return None
+
+
+def _time_to_minutes(time_string: str) -> Optional[int]:
+    if not time_string:
+        return None
+    time = datetime.time(*map(int, time_string.split(":")))
+    return time.hour * 60 + time.minute
+
+
+def _duration_to_minutes(duration_string: str) -> Optional[int]:
+    if not duration_string:
+        return None
+    hours, minutes = map(int, duration_string.split(":"))
+    return hours * 60 + minutes
@@ -8,14 +8,21 @@ from heath.exceptions import (
     MonthPreviousDayNotCompletedError,
 )
 from heath.time_period import TimePeriod
+from heath.work_calendar import WorkCalendar
 
 
 class Month(TimePeriod):
-    def __init__(self, year: int, month: int) -> None:
+    def __init__(
+        self, year: int, month: int, work_calendar: Optional[WorkCalendar] = None
+    ) -> None:
         super().__init__()
         self.year = year
         self.month = month
+        self.work_calendar = work_calendar or WorkCalendar(year)
         self.title = f"{calendar.month_name[self.month]} {self.year}".capitalize()
+        # Days are only added when all previous days are completed, so the
+        # days before this index never have to be checked again.
+        self._completed_days = 0
 
     @property
     def key(self) -> str:
@@ -23,16 +30,27 @@ class Month(TimePeriod):
 
     @property
     def next_work_date(self) -> Optional[datetime.date]:
-        days_in_month = calendar.monthrange(self.year, self.month)[1]
-        first_potential_day = self.days[-1].date.day + 1 if self.days else 1
-        for day_number in range(first_potential_day, days_in_month + 1):
-            potential_date = datetime.date(self.year, self.month, day_number)
-            if potential_date in self._non_working_dates:
-                continue
-            if potential_date.isoweekday() < 6:
-                return potential_date
+        first_potential_date = (
+            self.days[-1].date + datetime.timedelta(days=1)
+            if self.days
+            else datetime.date(self.year, self.month, 1)
+        )
+        next_work_date = self.work_calendar.next_work_date(first_potential_date)
+        if next_work_date and next_work_date.month == self.month:
+            return next_work_date
         return None
 
+    @property
+    def work_day_numbers(self) -> list[int]:
+        days_in_month = calendar.monthrange(self.year, self.month)[1]
+        return [
+            work_date.day
+            for work_date in self.work_calendar.work_dates_between(
+                datetime.date(self.year, self.month, 1),
+                datetime.date(self.year, self.month, days_in_month),
+            )
+        ]
+
     def worked_hours_for_project(self, project_name: str):
         return sum(
             (
@@ -50,10 +68,12 @@ class Month(TimePeriod):
         )
 
     def add_day(self, new_day: Day, allow_late_start: bool = False):
-        if any(not day.completed for day in self._days):
-            raise MonthPreviousDayNotCompletedError(
-                "All previous days are not completed."
-            )
+        while self._completed_days < len(self._days):
+            if not self._days[self._completed_days].completed:
+                raise MonthPreviousDayNotCompletedError(
+                    "All previous days are not completed."
+                )
+            self._completed_days += 1
 
         if new_day.date.year != self.year or new_day.date.month != self.month:
             raise MonthDateInconsistencyError(
@@ -69,12 +89,15 @@ class Month(TimePeriod):
             )
 
         self._days.append(new_day)
+        self._invalidate_all_days()
 
     def add_non_working_date(
         self, non_working_date: datetime.date, comment: str = None
     ):
         non_working_day = Day(non_working_date, comment, non_working_day=True)
         self._non_working_dates[non_working_date] = non_working_day
+        self.work_calendar.add_non_working_date(non_working_date)
+        self._invalidate_all_days()
 
     def serialize(self) -> str:
         return "\n".join(str(day) for day in self.days) + "\n"
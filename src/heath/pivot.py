@@ -0,0 +1,96 @@
+import datetime
+from collections import defaultdict
+from typing import Optional, Sequence
+
+from heath.day import Day
+
+
+class ProjectPivot:
+    """Durations of days in date order per day and project, built in one pass
+    over their shifts. The matrix is dense, with a row per day and a column
+    per project of the days, by key in the order they first appear. The days
+    remain the source of truth."""
+
+    def __init__(
+        self, days: Sequence[Day], read_time: Optional[datetime.datetime] = None
+    ):
+        # Open shifts are counted up to read_time if given, and otherwise not.
+        self.dates = []
+        # Hours per row and column, None where nothing is counted.
+        self.hours: list[list[Optional[datetime.timedelta]]] = []
+        # Whether the project of each row and column is all day.
+        self.all_day: list[list[bool]] = []
+        # Columns of each row, in the order they first appear in the days.
+        self.row_columns: list[list[int]] = []
+
+        columns = {}
+        rows = []
+        for day in days:
+            row = {}
+            for shift in day.shifts:
+                column = columns.setdefault(shift.project.key, len(columns))
+                hours, all_day = row.get(column, (None, False))
+                if shift.all_day:
+                    all_day = True
+                elif shift.completed:
+                    hours = (hours or datetime.timedelta()) + shift.duration
+                elif read_time is not None:
+                    hours = (hours or datetime.timedelta()) + shift.duration_at(
+                        read_time
+                    )
+                row[column] = hours, all_day
+            self.dates.append(day.date)
+            rows.append(row)
+
+        # The rows are made dense once the number of columns is known.
+        # The project key of each column.
+        self.keys: list[str] = list(columns)
+        for row in rows:
+            hours = [None] * len(self.keys)
+            all_day = [False] * len(self.keys)
+            for column, (column_hours, column_all_day) in row.items():
+                hours[column] = column_hours
+                all_day[column] = column_all_day
+            self.hours.append(hours)
+            self.all_day.append(all_day)
+            self.row_columns.append(sorted(row))
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def row(self, row: int) -> dict[str, Optional[datetime.timedelta]]:
+        """Durations per project key of a row, None for all day projects, as
+        Day.project_durations."""
+        durations = {}
+        for column in self.row_columns[row]:
+            if self.all_day[row][column]:
+                durations[self.keys[column]] = None
+            elif (hours := self.hours[row][column]) is not None:
+                durations[self.keys[column]] = hours
+        return durations
+
+    def rows(self) -> list[dict[str, Optional[datetime.timedelta]]]:
+        return [self.row(row) for row in range(len(self))]
+
+    def by_project(
+        self,
+    ) -> dict[str, dict[datetime.date, Optional[datetime.timedelta]]]:
+        projects = defaultdict(dict)
+        for date, durations in zip(self.dates, self.rows()):
+            for project, duration in durations.items():
+                projects[project][date] = duration
+        return projects
+
+    def row_totals(self, row: int) -> list[tuple[str, dict]]:
+        """Hours and all day counts per project key of a row, sorted by key,
+        as Day.report_data_by_project."""
+        return sorted(
+            (
+                self.keys[column],
+                {
+                    "hours": self.hours[row][column] or datetime.timedelta(),
+                    "days": int(self.all_day[row][column]),
+                },
+            )
+            for column in self.row_columns[row]
+        )
@@ -1,10 +1,12 @@
 import configparser
 import io
 from pathlib import Path
-from typing import Iterable, Self
+from typing import Iterable, Optional, Self
 
 
 class Project:
+    __slots__ = ("key", "name", "report", "all_day", "id")
+
     def __init__(
         self, key: str, name: str = "", report: str = "", all_day: bool = False
     ) -> None:
@@ -12,6 +14,9 @@ class Project:
         self.name = name
         self.report = report
         self.all_day = all_day
+        # Dense integer id given by the ledger the project is added to, so
+        # aggregations can index lists by project, see Ledger.add_project.
+        self.id: Optional[int] = None
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, self.__class__):
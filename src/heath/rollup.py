@@ -0,0 +1,87 @@
+import datetime
+from typing import Optional
+
+from heath.accumulator import Accumulator
+from heath.month import Month
+from heath.time_period import balance_sums, day_accumulators
+
+# Rollups stored with another version are not used.
+ROLLUP_VERSION = 3
+
+
+class MonthRollup:
+    """Totals of a closed month, for reports that can use them instead of the
+    days of the month. Closed months are over and have no open shifts."""
+
+    def __init__(
+        self,
+        year: int,
+        month: int,
+        worked: datetime.timedelta,
+        expected_worked: datetime.timedelta,
+        expected: datetime.timedelta,
+        projects: dict[str, dict],
+        accumulators: tuple[Accumulator, ...],
+    ):
+        self.date = datetime.date(year, month, 1)
+        # The balance sums of the month's days, see time_period.balance_sums.
+        self.worked = worked
+        self.expected_worked = expected_worked
+        self.expected = expected
+        # Hours and all day counts per project key, in order of appearance.
+        self.projects = projects
+        # Statistics, see time_period.day_accumulators.
+        self.accumulators = accumulators
+
+    @classmethod
+    def from_month(
+        cls, month: Month, today: Optional[datetime.date] = None
+    ) -> Optional["MonthRollup"]:
+        """The rollup of a month, or None if the month is not closed."""
+        today = today or datetime.date.today()
+        if (month.year, month.month) >= (today.year, today.month) or any(
+            day.totals.open_shifts for day in month.all_days
+        ):
+            return None
+        return cls(
+            month.year,
+            month.month,
+            *balance_sums(month.days),
+            dict(month._project_totals(include_active_day=False)),
+            day_accumulators(month.days),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MonthRollup":
+        return cls(
+            data["year"],
+            data["month"],
+            datetime.timedelta(seconds=data["worked"]),
+            datetime.timedelta(seconds=data["expected_worked"]),
+            datetime.timedelta(seconds=data["expected"]),
+            {
+                project: {"hours": datetime.timedelta(seconds=hours), "days": days}
+                for project, (hours, days) in data["projects"].items()
+            },
+            tuple(
+                Accumulator.from_dict(accumulator_data)
+                for accumulator_data in data["accumulators"]
+            ),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "version": ROLLUP_VERSION,
+            "year": self.date.year,
+            "month": self.date.month,
+            "worked": self.worked.total_seconds(),
+            "expected_worked": self.expected_worked.total_seconds(),
+            "expected": self.expected.total_seconds(),
+            "projects": {
+                project: (totals["hours"].total_seconds(), totals["days"])
+                for project, totals in self.projects.items()
+            },
+            "accumulators": [
+                accumulator.to_dict() for accumulator in self.accumulators
+            ],
+        }
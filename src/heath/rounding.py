@@ -0,0 +1,76 @@
+import datetime
+import heapq
+from typing import Hashable, Optional, Sequence, TypeVar
+
+HALF_AN_HOUR = datetime.timedelta(minutes=30)
+
+Key = TypeVar("Key", bound=Hashable)
+
+
+def round_durations(
+    durations: dict[Key, Optional[datetime.timedelta]],
+    granularity: datetime.timedelta = HALF_AN_HOUR,
+    total: Optional[datetime.timedelta] = None,
+) -> dict[Key, Optional[datetime.timedelta]]:
+    """Round durations down or up to multiples of granularity, so that they
+    add up to total. Unless given, the total is the total of the durations
+    rounded to the nearest multiple, so it is kept if it is a multiple.
+
+    The durations with the largest remainders are rounded up, and of equal
+    remainders the last ones. None, as for all day projects, is kept.
+    """
+    rounded_durations = {}
+    remainders = []
+    exact_total = rounded_total = datetime.timedelta()
+    for index, (key, duration) in enumerate(durations.items()):
+        if duration is None:
+            rounded_durations[key] = None
+            continue
+        quotient, remainder = divmod(duration, granularity)
+        rounded_durations[key] = quotient * granularity
+        exact_total += duration
+        rounded_total += rounded_durations[key]
+        if remainder:
+            remainders.append((remainder, index, key))
+
+    if total is None:
+        total = nearest_multiple(exact_total, granularity)
+    round_ups = (total - rounded_total) // granularity
+    for _, _, key in heapq.nlargest(round_ups, remainders):
+        rounded_durations[key] += granularity
+    return rounded_durations
+
+
+def round_matrix(
+    rows: Sequence[dict[Key, Optional[datetime.timedelta]]],
+    granularity: datetime.timedelta = HALF_AN_HOUR,
+) -> list[dict[Key, Optional[datetime.timedelta]]]:
+    """Round durations per row, such as per day and project, to multiples of
+    granularity.
+
+    The total is rounded to the nearest multiple and apportioned over the
+    rows by their totals, and each row's rounded total over its durations.
+    So the total and the total of each row are kept if they are multiples,
+    and are otherwise rounded down or up.
+    """
+    row_totals = {
+        row: sum(
+            (duration for duration in durations.values() if duration is not None),
+            start=datetime.timedelta(),
+        )
+        for row, durations in enumerate(rows)
+    }
+    rounded_row_totals = round_durations(row_totals, granularity)
+    return [
+        round_durations(durations, granularity, rounded_row_totals[row])
+        for row, durations in enumerate(rows)
+    ]
+
+
+def nearest_multiple(
+    duration: datetime.timedelta, granularity: datetime.timedelta
+) -> datetime.timedelta:
+    quotient, remainder = divmod(duration, granularity)
+    if remainder * 2 >= granularity:
+        quotient += 1
+    return quotient * granularity
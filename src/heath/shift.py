@@ -1,17 +1,39 @@
 import datetime
+from typing import Optional
 
 from heath.exceptions import ShiftConsistencyError, ShiftError
 from heath.project import Project
 from heath.time_utils import pretty_duration, pretty_time
 
+# Shifts of a ledger mostly start and stop at the same few times, so equal
+# second counts share one int object instead of one per shift.
+_interned_seconds: dict[int, int] = {}
+
+
+def _intern(seconds: int) -> int:
+    return _interned_seconds.setdefault(seconds, seconds)
+
 
 class Shift:
+    # Times are kept as whole seconds from midnight of the shift date, and
+    # are only turned into datetimes when read.
+    __slots__ = (
+        "project",
+        "date",
+        "day",
+        "_start_seconds",
+        "_stop_seconds",
+        "_lunch_seconds",
+    )
+
     def __init__(self, project: Project, date: datetime.date):
         self.project = project
         self.date = date
-        self._start_time = None
-        self._stop_time = None
-        self._lunch_duration = datetime.timedelta()
+        # The day the shift has been added to, told about any changes.
+        self.day = None
+        self._start_seconds: Optional[int] = None
+        self._stop_seconds: Optional[int] = None
+        self._lunch_seconds = 0
 
     def __str__(self):
         string = self.project.key
@@ -29,30 +51,32 @@ class Shift:
 
     @property
     def start_time(self) -> datetime.datetime:
-        return self._start_time
+        return self._datetime(self._start_seconds)
 
     @property
     def lunch_duration(self) -> datetime.timedelta:
-        return self._lunch_duration
+        return datetime.timedelta(seconds=self._lunch_seconds)
 
     @property
     def stop_time(self) -> datetime.datetime:
-        return self._stop_time
+        return self._datetime(self._stop_seconds)
 
     @property
     def started(self) -> bool:
-        return self.start_time is not None
+        return self._start_seconds is not None
 
     @property
     def completed(self) -> bool:
         return self.all_day or (
-            self.start_time is not None and self.stop_time is not None
+            self._start_seconds is not None and self._stop_seconds is not None
         )
 
     @property
     def duration(self) -> datetime.timedelta:
-        if self.stop_time is not None:
-            return self.stop_time - self.start_time - self.lunch_duration
+        if self._stop_seconds is not None:
+            return datetime.timedelta(
+                seconds=self._stop_seconds - self._start_seconds - self._lunch_seconds
+            )
         else:
             return datetime.timedelta()
 
@@ -71,12 +95,14 @@ class Shift:
     def start(self, start_time: datetime.datetime):
         if self.all_day:
             raise ShiftError("All day shifts cant be started.")
-        self._start_time = start_time
+        self._start_seconds = self._seconds(start_time)
+        self._changed()
 
     def lunch(self, lunch_duration: datetime.timedelta):
         if not self.started:
             raise ShiftConsistencyError("Shift must be started to have a lunch.")
-        self._lunch_duration = lunch_duration
+        self._lunch_seconds = _intern(lunch_duration // datetime.timedelta(seconds=1))
+        self._changed()
 
     def stop(self, stop_time: datetime.datetime):
         if not self.started:
@@ -94,7 +120,22 @@ class Shift:
             raise ShiftConsistencyError(
                 "Shift can't be stopped before start plus lunch."
             )
-        self._stop_time = stop_time
+        self._stop_seconds = self._seconds(stop_time)
+        self._changed()
+
+    def _changed(self):
+        if self.day is not None:
+            self.day.shift_changed()
+
+    def _seconds(self, time: datetime.datetime) -> int:
+        midnight = datetime.datetime.combine(self.date, datetime.time())
+        return _intern((time - midnight) // datetime.timedelta(seconds=1))
+
+    def _datetime(self, seconds: Optional[int]) -> Optional[datetime.datetime]:
+        if seconds is None:
+            return None
+        midnight = datetime.datetime.combine(self.date, datetime.time())
+        return midnight + datetime.timedelta(seconds=seconds)
 
     def report_data(self, include_active_shift: bool = False):
         start_stop = ""
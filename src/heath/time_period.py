@@ -1,15 +1,16 @@
 from collections import defaultdict
 import datetime
-import statistics
-from typing import Collection, Optional
+import heapq
+from typing import Callable, Collection, Iterable, Optional, Sequence
 
 from tabulate import tabulate
 
+from heath.accumulator import Accumulator
 from heath.day import Day
+from heath.pivot import ProjectPivot
+from heath.rounding import HALF_AN_HOUR, round_matrix
 from heath.time_utils import pretty_duration, time_to_seconds, pretty_days
 
-HALF_AN_HOUR = 60 * 30
-
 
 class Ansi:
     RED = "\033[91m"
@@ -29,6 +30,18 @@ class TimePeriod:
     def __init__(self):
         self._days: list[Day] = []
         self._non_working_dates = {}
+        self._merged_days: Optional[list[Day]] = None
+        # Vectorized aggregates over the days, see heath.columnar.
+        self._columns = None
+        # Worked hours and balance from a heath.balance_index.BalanceIndex.
+        self._sums = None
+        # Closed months in the period that are summarized by rollups instead
+        # of days, see heath.rollup.
+        self._rollups = []
+        # A pivot of days, with the days and Day.changes it is of.
+        self._pivot: Optional[tuple[tuple[Day, ...], int, ProjectPivot]] = None
+        # Number of times all_days has been merged, for tests.
+        self.all_days_merges = 0
         self.title = ""
 
     @property
@@ -41,9 +54,26 @@ class TimePeriod:
 
     @property
     def all_days(self) -> list[Day]:
-        return sorted(
-            self.days + list(self._non_working_dates.values()), key=lambda d: d.date
-        )
+        # Days are added in date order, so the days and the non working days
+        # only have to be merged, and only after either has changed.
+        if self._merged_days is None:
+            self._merged_days = list(
+                heapq.merge(
+                    self.days,
+                    sorted(self._non_working_dates.values(), key=lambda d: d.date),
+                    key=lambda d: d.date,
+                )
+            )
+            self.all_days_merges += 1
+        return self._merged_days
+
+    @property
+    def _loaded_all_days(self) -> Sequence[Day]:
+        # All days, except those of months that are summarized by rollups.
+        return self.all_days
+
+    def _invalidate_all_days(self):
+        self._merged_days = None
 
     @property
     def projects(self) -> list[str]:
@@ -55,18 +85,23 @@ class TimePeriod:
 
     @property
     def worked_hours(self) -> datetime.timedelta:
-        return sum((day.worked_hours for day in self.days), start=datetime.timedelta())
+        if self._sums is not None:
+            worked_hours = self._sums.worked_hours()
+        else:
+            worked_hours = total_worked_hours(self._days)
+        return sum((rollup.worked for rollup in self._rollups), start=worked_hours)
 
     @property
     def balance(self) -> tuple[str, datetime.timedelta]:
-        non_all_day_days = [day for day in self.complete_days if not day.all_day]
-        worked_hours = sum(
-            (day.worked_hours for day in non_all_day_days), datetime.timedelta()
-        )
-        expected_hours = len(non_all_day_days) * datetime.timedelta(hours=8)
-        balance = abs(expected_hours - worked_hours)
-        sign = "+" if self.worked_hours > expected_hours else "-"
-        return sign, balance
+        if self._sums is not None:
+            total_hours, worked_hours, expected_hours = self._sums.balance_sums()
+        else:
+            total_hours, worked_hours, expected_hours = balance_sums(self._days)
+        for rollup in self._rollups:
+            total_hours += rollup.worked
+            worked_hours += rollup.expected_worked
+            expected_hours += rollup.expected
+        return signed_balance(total_hours, worked_hours, expected_hours)
 
     def duration_at(self, read_time: datetime.datetime) -> datetime.timedelta:
         return sum(
@@ -75,17 +110,30 @@ class TimePeriod:
         )
 
     def project_durations(self, include_active_day: bool = False):
-        projects = defaultdict(dict)
-        for day in self.all_days:
-            for project, duration in day.project_durations(
-                include_active_shifts=include_active_day
-            ).items():
-                projects[project][day.date] = duration
-        return projects
+        return self._project_pivot(self.all_days, include_active_day).by_project()
+
+    def _project_pivot(
+        self, days: Sequence[Day], include_active_day: bool
+    ) -> ProjectPivot:
+        # The by project reports share the pivot of their days, which is kept
+        # until the days change unless the durations of open shifts are
+        # included.
+        if include_active_day:
+            return ProjectPivot(
+                days, datetime.datetime.now().replace(second=0, microsecond=0)
+            )
+        # The days are compared, and not only the sequence of them, since
+        # ranges of a day index change as days are inserted.
+        days = tuple(days)
+        pivot_days, changes, pivot = self._pivot or ((), None, None)
+        if pivot_days != days or changes != Day.changes:
+            pivot = ProjectPivot(days)
+            self._pivot = (days, Day.changes, pivot)
+        return pivot
 
     @property
     def last_day(self) -> Optional[Day]:
-        return self._days[-1] if self._days else None
+        return self.days[-1] if self.days else None
 
     def get_day(self, date_number: int) -> Optional[Day]:
         requested_date = datetime.date(self.year, self.month, date_number)
@@ -95,7 +143,7 @@ class TimePeriod:
         return self._non_working_dates.get(requested_date)
 
     def __iter__(self):
-        return self._days.__iter__()
+        return self.days.__iter__()
 
     def report(
         self,
@@ -104,12 +152,16 @@ class TimePeriod:
         by_project: bool = False,
         by_project_total: bool = False,
         round_project_durations: bool = False,
+        rounding_granularity: datetime.timedelta = HALF_AN_HOUR,
     ) -> str:
         if by_project_total:
             report_data = self._report_data_for_project_totals(include_active_day)
         elif by_project:
             report_data = self._report_data_by_project(
-                include_active_day, include_comments, round_project_durations
+                include_active_day,
+                include_comments,
+                round_project_durations,
+                rounding_granularity,
             )
         else:
             report_data = self._report_data_by_day(include_active_day, include_comments)
@@ -174,21 +226,18 @@ class TimePeriod:
         include_active_day: bool,
         include_comments: bool,
         round_project_durations: bool,
+        rounding_granularity: datetime.timedelta = HALF_AN_HOUR,
     ):
-        project_durations = self.project_durations(
-            include_active_day=include_active_day
-        )
+        all_days = self.all_days
+        pivot = self._project_pivot(all_days, include_active_day)
+        date_project_durations = pivot.rows()
         if round_project_durations:
-            for project, durations in project_durations.items():
-                project_durations[project] = lossless_round(durations)
-
-        date_project_durations = defaultdict(dict)
-        for project, dates in project_durations.items():
-            for date, duration in dates.items():
-                date_project_durations[date][project] = duration
+            date_project_durations = round_matrix(
+                date_project_durations, rounding_granularity
+            )
 
         report_data = []
-        for day in self.all_days:
+        for day, project_durations in zip(all_days, date_project_durations):
             date_string = f"{day.date.strftime('%a')} {day.date.day:>2}.".capitalize()
             comment_string = (
                 Ansi.italics(f"# {day.comment}")
@@ -199,7 +248,7 @@ class TimePeriod:
             if not day.shifts:
                 report_data.append((Ansi.red(date_string), Ansi.red(day.comment)))
             else:
-                for project, duration in date_project_durations[day.date].items():
+                for project, duration in project_durations.items():
                     report_data.append(
                         (
                             date_string,
@@ -213,16 +262,10 @@ class TimePeriod:
         return report_data
 
     def _report_data_for_project_totals(self, include_active_day):
-        projects = defaultdict(lambda: {"hours": datetime.timedelta(), "days": 0})
-
-        day_data = [
-            day.report_data_by_project(include_active_shift=include_active_day)
-            for day in self.all_days
-        ]
-        for day in day_data:
-            for project, duration in day:
-                projects[project]["days"] += duration["days"]
-                projects[project]["hours"] += duration["hours"]
+        if self._columns is not None and not include_active_day and not self._rollups:
+            projects = self._columns.project_totals()
+        else:
+            projects = self._project_totals(include_active_day)
         return [
             (project, pretty_days(duration["days"]).rjust(6), "d")
             if duration["days"]
@@ -230,8 +273,26 @@ class TimePeriod:
             for project, duration in projects.items()
         ]
 
+    def _project_totals(self, include_active_day):
+        projects = defaultdict(lambda: {"hours": datetime.timedelta(), "days": 0})
+        pivot = self._project_pivot(self._loaded_all_days, include_active_day)
+
+        # Rollups are merged in by date, so projects keep the order they first
+        # appear in.
+        for _, project_data in heapq.merge(
+            ((date, pivot.row_totals(row)) for row, date in enumerate(pivot.dates)),
+            ((rollup.date, rollup.projects.items()) for rollup in self._rollups),
+            key=lambda date_and_data: date_and_data[0],
+        ):
+            for project, duration in project_data:
+                projects[project]["days"] += duration["days"]
+                projects[project]["hours"] += duration["hours"]
+        return projects
+
     def statistics_report(self):
-        table = tabulate(self.statistics(), headers=("", "Medel", "Median", "SD"))
+        table = tabulate(
+            self.statistics(), headers=("", "Medel", "Median", "SD", "P10", "P90")
+        )
         original_line = table.splitlines()[1]
         solid_line = "-" * len(original_line)
         return "\n".join(
@@ -245,50 +306,29 @@ class TimePeriod:
         )
 
     def statistics(self):
-        start_stats = mean_median_std(
-            [
-                time_to_seconds(day.start_time.time())
-                for day in self.days
-                if day.start_time
-            ]
-        )
-
-        stop_stats = mean_median_std(
-            [
-                time_to_seconds(day.stop_time.time())
-                for day in self.days
-                if day.stop_time
-            ]
-        )
-
-        lunch_stats = mean_median_std(
-            [day.lunch.total_seconds() for day in self.days if day.lunch]
-        )
-
-        return (
+        return tuple(
             (
-                "Start",
+                label,
                 *(
                     pretty_duration(stat, round_seconds=True).rjust(5)
-                    for stat in start_stats
+                    for stat in accumulator.summary()
                 ),
-            ),
-            (
-                "Slut",
-                *(
-                    pretty_duration(stat, round_seconds=True).rjust(5)
-                    for stat in stop_stats
-                ),
-            ),
-            (
-                "Lunch",
-                *(
-                    pretty_duration(stat, round_seconds=True).rjust(5)
-                    for stat in lunch_stats
-                ),
-            ),
+            )
+            for label, accumulator in zip(
+                ("Start", "Slut", "Lunch", "Arbetstid"), self.statistics_accumulators()
+            )
         )
 
+    def statistics_accumulators(self) -> tuple[Accumulator, ...]:
+        """Accumulators of start, stop, lunch and worked hours per day."""
+        accumulators = day_accumulators(self._days)
+        for rollup in self._rollups:
+            for accumulator, rollup_accumulator in zip(
+                accumulators, rollup.accumulators
+            ):
+                accumulator.merge(rollup_accumulator)
+        return accumulators
+
     def overview(self):
         sign, balance = self.balance
         table = tabulate(
@@ -312,48 +352,73 @@ class TimePeriod:
         )
 
 
-def lossless_round(
-    durations: dict[datetime.date, datetime.timedelta],
-) -> dict[datetime.date, datetime.timedelta]:
-    total_remainders = 0
-    remainders = []
-    rounded_durations = {}
-    total_remainders = 0
-    for date, duration in durations.items():
-        if duration is None:
-            rounded_durations[date] = None
-            continue
-        remainder = duration.total_seconds() % HALF_AN_HOUR
-        total_remainders += remainder
-        remainders.append((remainder, date))
-        rounded_durations[date] = duration - datetime.timedelta(seconds=remainder)
-    remainders.sort()
+# The functions below only iterate their days once, so they can fold over a
+# stream of days (e.g. from Ledger.stream_month) as well as over a TimePeriod.
 
-    adjustment_budget, remainder = divmod(total_remainders, HALF_AN_HOUR)
-    if remainder:
-        return durations
 
-    for _ in range(int(adjustment_budget)):
-        remainder, date = remainders.pop()
-        rounded_durations[date] += datetime.timedelta(seconds=HALF_AN_HOUR)
+def total_worked_hours(days: Iterable[Day]) -> datetime.timedelta:
+    return sum((day.worked_hours for day in days), start=datetime.timedelta())
 
-    return rounded_durations
 
+def total_balance(days: Iterable[Day]) -> tuple[str, datetime.timedelta]:
+    return signed_balance(*balance_sums(days))
 
-def mean_median_std(
-    timepoints: list[float],
-) -> tuple[datetime.timedelta, datetime.timedelta, datetime.timedelta]:
-    mean_time = statistics.mean(timepoints) if len(timepoints) > 1 else None
-    median_time = statistics.median(timepoints) if len(timepoints) > 1 else None
-    standard_deviation = statistics.stdev(timepoints) if len(timepoints) > 1 else None
 
-    return (
-        None if mean_time is None else datetime.timedelta(seconds=mean_time),
-        None if median_time is None else datetime.timedelta(seconds=median_time),
-        None
-        if standard_deviation is None
-        else datetime.timedelta(seconds=standard_deviation),
-    )
+def balance_sums(
+    days: Iterable[Day],
+) -> tuple[datetime.timedelta, datetime.timedelta, datetime.timedelta]:
+    """Worked hours, worked hours of completed days that are expected to be
+    worked and the expected hours of those days."""
+    total_hours = datetime.timedelta()
+    worked_hours = datetime.timedelta()
+    expected_hours = datetime.timedelta()
+    for day in days:
+        day_worked_hours = day.worked_hours
+        total_hours += day_worked_hours
+        if day.completed and not day.all_day:
+            worked_hours += day_worked_hours
+            expected_hours += datetime.timedelta(hours=8)
+    return total_hours, worked_hours, expected_hours
+
+
+def signed_balance(
+    total_hours: datetime.timedelta,
+    worked_hours: datetime.timedelta,
+    expected_hours: datetime.timedelta,
+) -> tuple[str, datetime.timedelta]:
+    balance = abs(expected_hours - worked_hours)
+    sign = "+" if total_hours > expected_hours else "-"
+    return sign, balance
+
+
+def day_accumulators(days: Iterable[Day]) -> tuple[Accumulator, ...]:
+    """Accumulators of start and stop times of day, lunch and of worked hours
+    of completed days, in seconds."""
+    starts, stops, lunches, worked = (Accumulator() for _ in range(4))
+    for day in days:
+        if not day.shifts:
+            continue
+        if start_time := day.start_time:
+            starts.add(time_to_seconds(start_time))
+        if stop_time := day.stop_time:
+            stops.add(time_to_seconds(stop_time))
+        if lunch := day.lunch:
+            lunches.add(lunch // datetime.timedelta(seconds=1))
+        if day.completed and not day.all_day:
+            worked.add(day.worked_hours // datetime.timedelta(seconds=1))
+    return starts, stops, lunches, worked
+
+
+def durations_by_project(
+    days: Iterable[Day], include_active_day: bool = False
+) -> dict[str, dict[datetime.date, Optional[datetime.timedelta]]]:
+    projects = defaultdict(dict)
+    for day in days:
+        for project, duration in day.project_durations(
+            include_active_shifts=include_active_day
+        ).items():
+            projects[project][day.date] = duration
+    return projects
 
 
 class CustomTimePeriod(TimePeriod):
@@ -368,9 +433,73 @@ class CustomTimePeriod(TimePeriod):
         self.first_date = first_date
         self.last_date = last_date
         self.title = title
+        self._all_days = None
+        self._load_rolled_up_months: Optional[Callable[[], CustomTimePeriod]] = None
         for day in days:
             if self.first_date <= day.date <= self.last_date:
                 if day.non_working_day:
                     self._non_working_dates[day.date] = day
                 else:
                     self._days.append(day)
+
+    @classmethod
+    def from_views(
+        cls,
+        first_date: datetime.date,
+        last_date: datetime.date,
+        days: Sequence[Day],
+        all_days: Sequence[Day],
+        title="",
+        columns=None,
+        sums=None,
+        rollups: Sequence = (),
+        load_rolled_up_months: Optional[Callable[[], "CustomTimePeriod"]] = None,
+    ) -> "CustomTimePeriod":
+        # Uses date ordered sequences of the working days and of all days in
+        # the period as they are, without copying or filtering them. Columns
+        # for the working days may be given for vectorized aggregates, and
+        # sums for their worked hours and balance. Months that are not loaded
+        # may be given as rollups, together with a function that loads them
+        # and returns the time period of all days, for when days are needed.
+        time_period = cls(first_date, last_date, (), title)
+        time_period._days = days
+        time_period._all_days = all_days
+        time_period._columns = columns
+        time_period._sums = sums
+        time_period._rollups = list(rollups)
+        time_period._load_rolled_up_months = load_rolled_up_months
+        return time_period
+
+    @property
+    def days(self) -> Sequence[Day]:
+        self._load_days()
+        return self._days
+
+    @property
+    def all_days(self) -> Sequence[Day]:
+        self._load_days()
+        return self._loaded_all_days
+
+    @property
+    def _loaded_all_days(self) -> Sequence[Day]:
+        if self._all_days is not None:
+            return self._all_days
+        return super().all_days
+
+    def drop_rollup(self, year: int, month: int):
+        """Stops using the rollup of a month, once its days are loaded."""
+        month_date = datetime.date(year, month, 1)
+        self._rollups = [
+            rollup for rollup in self._rollups if rollup.date != month_date
+        ]
+
+    def _load_days(self):
+        if self._load_rolled_up_months is None:
+            return
+        loaded = self._load_rolled_up_months()
+        self._days = loaded._days
+        self._all_days = loaded._all_days
+        self._columns = loaded._columns
+        self._sums = loaded._sums
+        self._rollups = []
+        self._load_rolled_up_months = None
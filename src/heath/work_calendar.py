@@ -0,0 +1,87 @@
+import bisect
+import datetime
+from typing import Iterable, Optional
+
+from heath.exceptions import DateInconsistencyError
+
+WORK_DAY_HOURS = datetime.timedelta(hours=8)
+
+
+class WorkCalendar:
+    """The work days of a year: weekdays that are not non working dates."""
+
+    def __init__(self, year: int, non_working_dates: Iterable[datetime.date] = ()):
+        self.year = year
+        self._non_working_dates = set()
+        self._ordinals: Optional[list[int]] = None
+        for non_working_date in non_working_dates:
+            self.add_non_working_date(non_working_date)
+
+    @property
+    def ordinals(self) -> list[int]:
+        """Ordinals of the work days of the year, in date order."""
+        if self._ordinals is None:
+            first_ordinal = datetime.date(self.year, 1, 1).toordinal()
+            last_ordinal = datetime.date(self.year, 12, 31).toordinal()
+            self._ordinals = [
+                ordinal
+                for ordinal in range(first_ordinal, last_ordinal + 1)
+                # Ordinal 1 is a Monday, so weekdays have remainders 1-5.
+                if ordinal % 7 not in (6, 0) and ordinal not in self._non_working_dates
+            ]
+        return self._ordinals
+
+    def add_non_working_date(self, non_working_date: datetime.date):
+        if non_working_date.year != self.year:
+            raise DateInconsistencyError(
+                f"Non working date is outside year. {non_working_date} not in {self.year}"
+            )
+        # Months replay the non working dates of their year, which should not
+        # rebuild the work days.
+        if non_working_date.toordinal() in self._non_working_dates:
+            return
+        self._non_working_dates.add(non_working_date.toordinal())
+        self._ordinals = None
+
+    def is_work_day(self, date: datetime.date) -> bool:
+        index = bisect.bisect_left(self.ordinals, date.toordinal())
+        return index < len(self.ordinals) and self.ordinals[index] == date.toordinal()
+
+    def next_work_date(self, date: datetime.date) -> Optional[datetime.date]:
+        """The first work day on or after date, within the year."""
+        index = bisect.bisect_left(self.ordinals, date.toordinal())
+        if index < len(self.ordinals):
+            return datetime.date.fromordinal(self.ordinals[index])
+        return None
+
+    def previous_work_date(self, date: datetime.date) -> Optional[datetime.date]:
+        """The last work day on or before date, within the year."""
+        index = bisect.bisect_right(self.ordinals, date.toordinal())
+        if index:
+            return datetime.date.fromordinal(self.ordinals[index - 1])
+        return None
+
+    def work_dates_between(
+        self, first_date: datetime.date, last_date: datetime.date
+    ) -> list[datetime.date]:
+        first, last = self._positions(first_date, last_date)
+        return [datetime.date.fromordinal(o) for o in self.ordinals[first:last]]
+
+    def work_days_between(
+        self, first_date: datetime.date, last_date: datetime.date
+    ) -> int:
+        first, last = self._positions(first_date, last_date)
+        return max(last - first, 0)
+
+    def expected_hours(
+        self, first_date: datetime.date, last_date: datetime.date
+    ) -> datetime.timedelta:
+        return self.work_days_between(first_date, last_date) * WORK_DAY_HOURS
+
+    def _positions(
+        self, first_date: datetime.date, last_date: datetime.date
+    ) -> tuple[int, int]:
+        return (
+            bisect.bisect_left(self.ordinals, first_date.toordinal()),
+            bisect.bisect_right(self.ordinals, last_date.toordinal()),
+        )
@@ -0,0 +1,70 @@
+from typing import Sequence
+
+from tabulate import tabulate
+
+from heath.time_period import TimePeriod
+from heath.time_utils import pretty_duration
+
+
+class YearsReport:
+    """Reports with one row per year, for a number of years and for all of
+    them together."""
+
+    def __init__(self, years: Sequence[TimePeriod], total: TimePeriod):
+        self.years = years
+        self.total = total
+
+    def report(self) -> str:
+        return self._table(
+            ("År", "Arbetade timmar", "Balans"),
+            [
+                (time_period.title, *self._overview_data(time_period))
+                for time_period in (*self.years, self.total)
+            ],
+        )
+
+    def project_report(self) -> str:
+        report_data = []
+        for time_period in (*self.years, self.total):
+            title = time_period.title
+            for project_data in time_period._report_data_for_project_totals(False):
+                report_data.append((title, *project_data))
+                title = ""
+        return self._table(("År", "Projekt", "Timmar", ""), report_data)
+
+    def statistics_report(self) -> str:
+        # The mean start, stop, lunch and worked hours per day of each year.
+        return self._table(
+            ("År", "Start", "Slut", "Lunch", "Arbetstid"),
+            [
+                (
+                    time_period.title,
+                    *(statistic[1] for statistic in time_period.statistics()),
+                )
+                for time_period in (*self.years, self.total)
+            ],
+        )
+
+    @staticmethod
+    def _overview_data(time_period: TimePeriod) -> tuple[str, str]:
+        sign, balance = time_period.balance
+        return (
+            pretty_duration(time_period.worked_hours).rjust(6),
+            f"{sign if balance else ''}{pretty_duration(balance)}".rjust(6),
+        )
+
+    def _table(self, headers: tuple[str, ...], report_data: list[tuple]) -> str:
+        table = tabulate(report_data, headers=headers)
+        original_line = table.splitlines()[1]
+        solid_line = "-" * len(original_line)
+        return "\n".join(
+            (
+                solid_line,
+                f"{self.years[0].title} - {self.years[-1].title}".center(
+                    len(solid_line)
+                ),
+                solid_line,
+                table,
+                solid_line,
+            )
+        )
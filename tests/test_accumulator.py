@@ -0,0 +1,62 @@
+import random
+import statistics
+from datetime import timedelta
+
+from heath.accumulator import Accumulator
+
+RANDOM = random.Random(23)
+
+
+def given_accumulator(samples: list[int]) -> Accumulator:
+    accumulator = Accumulator()
+    for sample in samples:
+        accumulator.add(sample)
+    return accumulator
+
+
+def test_accumulator_gives_the_statistics_of_its_samples():
+    # Given samples of whole seconds
+    given_samples = [RANDOM.randint(6 * 3600, 10 * 3600) for _ in range(101)]
+
+    # When accumulating the samples
+    accumulator = given_accumulator(given_samples)
+
+    # Then the statistics are those of the samples
+    mean, median, standard_deviation, p10, p90 = accumulator.summary()
+    assert abs(mean.total_seconds() - statistics.mean(given_samples)) < 1e-6
+    assert median == timedelta(seconds=statistics.median(given_samples))
+    assert (
+        abs(standard_deviation.total_seconds() - statistics.stdev(given_samples)) < 1e-6
+    )
+    deciles = statistics.quantiles(given_samples, n=10, method="inclusive")
+    assert p10 == timedelta(seconds=deciles[0])
+    assert p90 == timedelta(seconds=deciles[-1])
+
+
+def test_merged_accumulators_equal_one_accumulator_of_all_samples():
+    # Given accumulators of parts of some samples
+    given_samples = [RANDOM.randint(0, 3600) for _ in range(100)]
+    given_parts = [given_samples[:10], given_samples[10:11], [], given_samples[11:]]
+
+    # When merging the accumulators
+    accumulator = Accumulator()
+    for part in given_parts:
+        accumulator.merge(given_accumulator(part))
+
+    # Then they give the statistics of all samples
+    expected = given_accumulator(given_samples)
+    assert accumulator.count == expected.count
+    assert abs(accumulator.mean - expected.mean) < 1e-6
+    assert abs(accumulator.standard_deviation - expected.standard_deviation) < 1e-6
+    assert accumulator.histogram == expected.histogram
+
+    # And they are the same after a round trip to a dict
+    assert Accumulator.from_dict(accumulator.to_dict()).summary() == (
+        accumulator.summary()
+    )
+
+
+def test_accumulator_needs_two_samples_for_statistics():
+    assert given_accumulator([]).summary() == (None,) * 5
+    assert given_accumulator([60]).summary() == (None,) * 5
+    assert given_accumulator([60, 120]).summary()[1] == timedelta(seconds=90)
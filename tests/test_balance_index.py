@@ -0,0 +1,57 @@
+from datetime import date, datetime, time, timedelta
+
+from heath.shift import Shift
+from heath.time_period import total_balance, total_worked_hours
+
+from tests.utilities import given_day_string, given_ledger_with_months
+
+
+def test_time_periods_get_worked_hours_and_balance_from_the_sums():
+    # Given a ledger
+    given_ledger = given_ledger_with_months(2023, (1, 3, 8))
+
+    for first_date, last_date in (
+        (date(2023, 1, 1), date(2023, 12, 31)),
+        (date(2023, 1, 3), date(2023, 3, 3)),
+        (date(2023, 3, 4), date(2023, 3, 9)),
+        (date(2023, 5, 1), date(2023, 5, 31)),
+    ):
+        # When getting a time period
+        time_period = given_ledger.get_custom_time_period(first_date, last_date)
+
+        # Then the sums give the same totals as the days
+        assert time_period._sums is not None
+        assert time_period.worked_hours == total_worked_hours(time_period.days)
+        assert time_period.balance == total_balance(time_period.days)
+
+
+def test_sums_are_updated_from_the_first_changed_day():
+    # Given a ledger with sums over all days
+    given_ledger = given_ledger_with_months(2023, (1, 3, 8))
+    given_ledger.get_year(2023).balance
+    version = given_ledger._work_days.version
+
+    # When a month is parsed again with other days
+    given_ledger.forget_month(2023, 3)
+    given_ledger.parse_month(
+        2023, 3, "\n".join(given_day_string(day_number) for day_number in (1, 2, 3))
+    )
+
+    # Then the sums are updated from the first day of the month
+    assert given_ledger._work_days.first_changed(version) == 20
+    year = given_ledger.get_year(2023)
+    assert year.worked_hours == total_worked_hours(year.days)
+    assert year.balance == total_balance(year.days)
+
+    # When a shift is added to the last day
+    worked_hours = year.worked_hours
+    last_day = given_ledger.last_day
+    shift = Shift(given_ledger.get_project("P1"), last_day.date)
+    shift.start(datetime.combine(last_day.date, time(19)))
+    last_day.add_shift(shift)
+    shift.stop(datetime.combine(last_day.date, time(20)))
+
+    # Then the sums include the new shift
+    year = given_ledger.get_year(2023)
+    assert year.worked_hours == worked_hours + timedelta(hours=1)
+    assert year.balance == total_balance(year.days)
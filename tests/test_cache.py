@@ -0,0 +1,185 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from heath.cache import LedgerCache
+from heath.folder import LedgerFolder
+from heath.ledger import Ledger
+from heath.project import Project
+from heath.rollup import MonthRollup
+
+
+def given_ledger_folder_with_month(tmp_path: Path, month_string: str) -> LedgerFolder:
+    (tmp_path / "2023-5.txt").write_text(month_string)
+    return LedgerFolder(tmp_path)
+
+
+def test_month_records_are_read_from_cache_when_file_is_unchanged(tmp_path: Path):
+    # Given a ledger folder with a month file
+    given_folder = given_ledger_folder_with_month(
+        tmp_path, "2. Project1 9:00 - 17:00, Lunch 0:30 # Comment\n"
+    )
+    month_file = given_folder.months["2023-05"]
+
+    # Given the month has been parsed and saved to the cache
+    first_cache = LedgerCache(given_folder.cache)
+    expected_records = first_cache.month_records(month_file)
+    first_cache.save()
+    assert first_cache.misses == 1
+
+    # When reading the month with a new cache
+    second_cache = LedgerCache(given_folder.cache)
+    cached_records = second_cache.month_records(month_file)
+
+    # Then the records are read from the cache
+    assert second_cache.hits == 1
+    assert second_cache.misses == 0
+
+    # And the cached records builds the same month as the parsed records
+    parsed_ledger = Ledger()
+    parsed_ledger.add_project(Project("Project1"))
+    parsed_ledger.load_month(2023, 5, expected_records)
+
+    cached_ledger = Ledger()
+    cached_ledger.add_project(Project("Project1"))
+    cached_ledger.load_month(2023, 5, cached_records)
+
+    assert (
+        cached_ledger.current_month.serialize()
+        == parsed_ledger.current_month.serialize()
+    )
+    assert cached_ledger.current_month.worked_hours == timedelta(hours=7, minutes=30)
+    assert cached_ledger.current_month.get_day(2).comment == "Comment"
+
+
+def test_changed_month_file_is_parsed_again(tmp_path: Path):
+    # Given a cached month file
+    given_folder = given_ledger_folder_with_month(
+        tmp_path, "2. Project1 9:00 - 17:00\n"
+    )
+    month_file = given_folder.months["2023-05"]
+    first_cache = LedgerCache(given_folder.cache)
+    first_cache.month_records(month_file)
+    first_cache.save()
+
+    # When the month file is changed
+    month_file.write("2. Project1 9:00 - 17:00\n3. Project1 9:00 - 12:00\n")
+
+    # Then the cache is no longer valid for the month
+    second_cache = LedgerCache(given_folder.cache)
+    assert not second_cache.is_valid(month_file)
+
+    # And the month is parsed again
+    day_records = second_cache.month_records(month_file)
+    assert second_cache.misses == 1
+    assert len(day_records) == 2
+
+
+def test_touched_month_file_with_same_content_is_read_from_cache(tmp_path: Path):
+    # Given a cached month file
+    given_folder = given_ledger_folder_with_month(
+        tmp_path, "2. Project1 9:00 - 17:00\n"
+    )
+    month_file = given_folder.months["2023-05"]
+    first_cache = LedgerCache(given_folder.cache)
+    first_cache.month_records(month_file)
+    first_cache.save()
+
+    # When only the modification time of the file is changed
+    stat = month_file.path.stat()
+    os.utime(month_file.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    # Then the month is still read from the cache
+    second_cache = LedgerCache(given_folder.cache)
+    second_cache.month_records(month_file)
+    assert second_cache.hits == 1
+
+
+def test_cleared_cache_is_removed_from_disk(tmp_path: Path):
+    # Given a saved cache
+    given_folder = given_ledger_folder_with_month(
+        tmp_path, "2. Project1 9:00 - 17:00\n"
+    )
+    given_cache = LedgerCache(given_folder.cache)
+    given_cache.month_records(given_folder.months["2023-05"])
+    given_cache.save()
+    assert given_folder.cache
+
+    # When clearing the cache
+    given_cache.clear()
+
+    # Then the cache file is removed
+    assert not given_folder.cache
+    assert given_cache.entries == {}
+
+
+def test_refresh_parses_all_stale_months_in_parallel(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    # Given a ledger folder with several month files
+    for month in range(1, 7):
+        (tmp_path / f"2023-{month}.txt").write_text(f"{month}. Project1 9:00 - 17:00\n")
+    given_folder = LedgerFolder(tmp_path)
+    pools = []
+
+    class RecordingProcessPoolExecutor(ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(
+        "heath.ledger.ProcessPoolExecutor", RecordingProcessPoolExecutor
+    )
+
+    # When refreshing the cache using several workers
+    given_cache = LedgerCache(given_folder.cache)
+    given_cache.refresh(given_folder.ordered_months, workers=2, threshold=2)
+
+    # Then the months are parsed in a process pool
+    assert len(pools) == 1
+
+    # And every month is parsed and valid in the cache
+    assert given_cache.misses == 6
+    assert [
+        given_cache.month_records(month_file)[0][0]
+        for month_file in given_folder.ordered_months
+    ] == list(range(1, 7))
+    assert all(
+        given_cache.is_valid(month_file) for month_file in given_folder.ordered_months
+    )
+
+
+def test_month_rollups_are_stored_with_the_cached_month(tmp_path: Path):
+    # Given a cached month file
+    given_folder = given_ledger_folder_with_month(
+        tmp_path, "2. Project1 9:00 - 17:00\n"
+    )
+    month_file = given_folder.months["2023-05"]
+    first_cache = LedgerCache(given_folder.cache)
+    first_cache.use_rollup_context("Projects")
+    ledger = Ledger()
+    ledger.add_project(Project("Project1"))
+    ledger.load_month(2023, 5, first_cache.month_records(month_file))
+
+    # When a rollup of the month is stored
+    rollup = MonthRollup.from_month(ledger.current_month, today=date(2023, 6, 1))
+    first_cache.store_rollup(month_file, rollup)
+    first_cache.save()
+
+    # Then it is read by a new cache with the same context
+    second_cache = LedgerCache(given_folder.cache)
+    second_cache.use_rollup_context("Projects")
+    assert second_cache.month_rollup(month_file).to_dict() == rollup.to_dict()
+
+    # But not with another context
+    second_cache.use_rollup_context("Other projects")
+    assert second_cache.month_rollup(month_file) is None
+
+    # And not after the month file is changed
+    month_file.write("2. Project1 9:00 - 18:00, Lunch 0:30\n")
+    third_cache = LedgerCache(given_folder.cache)
+    third_cache.use_rollup_context("Projects")
+    assert third_cache.month_rollup(month_file) is None
@@ -0,0 +1,64 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from heath.shift import Shift
+from heath.time_period import CustomTimePeriod
+
+from tests.utilities import given_ledger_with_months
+
+pytest.importorskip("numpy")
+
+from heath import columnar  # noqa: E402
+
+
+def test_columnar_aggregates_equal_aggregates_over_days():
+    # Given a ledger with a year of days
+    given_ledger = given_ledger_with_months(2023, range(1, 13), 2)
+
+    # When getting the year
+    year = given_ledger.get_year(2023)
+
+    # Then its aggregates are vectorized
+    assert year._columns is not None
+
+    # And they equal the aggregates over the days
+    days = CustomTimePeriod(date(2023, 1, 1), date(2023, 12, 31), year.days)
+    assert year.worked_hours == days.worked_hours
+    assert year.balance == days.balance
+    assert year._report_data_for_project_totals(False) == (
+        days._report_data_for_project_totals(False)
+    )
+
+
+def test_columnar_days_are_rebuilt_when_a_shift_changes():
+    # Given a year with aggregates from columnar days
+    given_ledger = given_ledger_with_months(2023, range(1, 13), 2)
+    hours = given_ledger.get_year(2023)._columns.project_totals()["P2"]["hours"]
+
+    # When adding a shift to the last day
+    last_day = given_ledger.last_day
+    shift = Shift(given_ledger.get_project("P2"), last_day.date)
+    shift.start(
+        datetime.combine(last_day.date, datetime.min.time()) + timedelta(hours=16)
+    )
+    last_day.add_shift(shift)
+    shift.stop(
+        datetime.combine(last_day.date, datetime.min.time()) + timedelta(hours=17)
+    )
+
+    # Then the aggregates include the new shift
+    project_totals = given_ledger.get_year(2023)._columns.project_totals()
+    assert project_totals["P2"]["hours"] == hours + timedelta(hours=1)
+
+
+def test_short_time_periods_are_aggregated_over_days():
+    # Given a ledger with a year of days
+    given_ledger = given_ledger_with_months(2023, range(1, 13), 2)
+
+    # When getting a week
+    week = given_ledger.get_week(10, 2023)
+
+    # Then its aggregates are not vectorized
+    assert len(week.days) < columnar.COLUMNAR_THRESHOLD
+    assert week._columns is None
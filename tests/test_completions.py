@@ -0,0 +1,83 @@
+import os
+from pathlib import Path
+from textwrap import dedent
+
+import click
+
+from heath import completions
+from heath.completions import CompletionIndex
+
+PROJECTS = dedent(
+    """\
+    [Project1]
+
+    [Vacation]
+    AllDay: True
+    """
+)
+
+
+def given_completion_context(tmp_path: Path, **params) -> click.Context:
+    (tmp_path / "projects.cfg").write_text(PROJECTS)
+    (tmp_path / "2023-5.txt").write_text(
+        "2. Project1 9:00 - 17:00, Lunch 0:30\n3. Project1 9:00 - 17:00, Lunch 0:30\n"
+    )
+    (tmp_path / "2023-6.txt").write_text("2. Project1 9:00 - 17:00, Lunch 0:30\n")
+    context = click.Context(click.Command("heath"))
+    context.params.update(folder=tmp_path, **params)
+    return context
+
+
+def test_projects_are_completed_by_all_day_flag(tmp_path: Path):
+    # Given a ledger folder with a regular and an all day project
+    given_context = given_completion_context(tmp_path)
+
+    # When completing projects
+    projects = completions.complete_projects(given_context, None, "")
+    all_day_projects = completions.complete_allday_projects(given_context, None, "v")
+
+    # Then the projects are separated by the all day flag
+    assert projects == ["Project1"]
+    assert all_day_projects == ["Vacation"]
+
+
+def test_dates_are_completed_from_month_files(tmp_path: Path):
+    # Given a ledger folder with two months
+    given_context = given_completion_context(tmp_path, day_number=2)
+
+    # When completing dates, months and years
+    dates = completions.complete_dates(given_context, None, "2023-05")
+    month_numbers = completions.complete_month_numbers(given_context, None, "")
+    years = completions.complete_years(given_context, None, "20")
+
+    # Then the completions are taken from the days with data
+    assert dates == ["2023-05-02", "2023-05-03"]
+    assert month_numbers == ["5", "6"]
+    assert years == ["2023"]
+
+
+def test_completion_index_is_updated_when_month_file_changes(tmp_path: Path):
+    # Given a completion index that has been saved
+    given_completion_context(tmp_path)
+    first_index = CompletionIndex(tmp_path)
+    assert len(first_index.dates) == 3
+    first_index.save()
+    index_file = tmp_path / ".heath-cache" / "completions.json"
+    saved_index = index_file.read_text()
+
+    # When reading it again without changes
+    second_index = CompletionIndex(tmp_path)
+    second_index.dates
+    second_index.save()
+
+    # Then the index file is not rewritten
+    assert index_file.read_text() == saved_index
+
+    # When a month file changes
+    month_file = tmp_path / "2023-6.txt"
+    month_file.write_text(month_file.read_text() + "5. Project1 9:00 - 17:00\n")
+    os.utime(month_file, ns=(0, 0))
+    third_index = CompletionIndex(tmp_path)
+
+    # Then the new day is completed
+    assert len(third_index.dates) == 4
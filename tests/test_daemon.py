@@ -0,0 +1,107 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from heath.daemon import LedgerDaemon, forward
+
+PROJECTS = """\
+[Project1]
+Name: Project 1
+Report: P1
+AllDay: False
+"""
+
+
+@pytest.fixture
+def given_ledger_folder(tmp_path: Path) -> Path:
+    (tmp_path / "projects.cfg").write_text(PROJECTS)
+    (tmp_path / "2023-5.txt").write_text("2. Project1 9:00 - 17:00\n")
+    (tmp_path / "2023-6.txt").write_text("1. Project1 8:00 - 16:30\n")
+    return tmp_path
+
+
+def test_forward_without_daemon_returns_none(given_ledger_folder: Path):
+    # Given a ledger folder without a running daemon
+    # When forwarding a command
+    # Then nothing is forwarded
+    assert forward(["day", "2", "5", "2023"], given_ledger_folder) is None
+
+
+def test_forwarded_command_is_run_by_daemon(given_ledger_folder: Path, capsys):
+    # Given a daemon serving the ledger folder
+    given_daemon = LedgerDaemon(given_ledger_folder)
+    given_daemon.listen()
+    threading.Thread(target=given_daemon.serve, daemon=True).start()
+
+    # When forwarding a command
+    exit_code = forward(["day", "2", "5", "2023"], given_ledger_folder)
+
+    # Then the command is run by the daemon and the output is returned
+    assert exit_code == 0
+    assert "9:00 -" in capsys.readouterr().out
+
+    # And interactive commands are not forwarded
+    assert forward(["edit", "5", "2023"], given_ledger_folder) is None
+    assert forward(["projects", "add"], given_ledger_folder) is None
+
+    # But commands are, even with arguments named as interactive commands
+    assert forward(["-j", "2", "projects", "ls"], given_ledger_folder) == 0
+    assert forward(["day", "2", "5", "2023", "add"], given_ledger_folder) == 2
+
+
+def test_daemon_keeps_serving_after_a_failed_request(
+    given_ledger_folder: Path, monkeypatch, capsys
+):
+    # Given a daemon serving the ledger folder
+    given_daemon = LedgerDaemon(given_ledger_folder)
+    given_daemon.listen()
+    threading.Thread(target=given_daemon.serve, daemon=True).start()
+
+    # When a request fails outside the command, e.g. when a month file is
+    # removed while the ledger is refreshed
+    def refresh():
+        raise FileNotFoundError("2023-6.txt")
+
+    monkeypatch.setattr(given_daemon, "refresh", refresh)
+    exit_code = forward(["day", "2", "5", "2023"], given_ledger_folder)
+
+    # Then an error is returned
+    assert exit_code == 1
+    assert "2023-6.txt" in capsys.readouterr().err
+
+    # And the daemon serves later requests
+    monkeypatch.undo()
+    assert forward(["day", "2", "5", "2023"], given_ledger_folder) == 0
+
+
+def test_daemon_reloads_only_months_changed_on_disk(given_ledger_folder: Path):
+    # Given a daemon where both months have been parsed
+    given_daemon = LedgerDaemon(given_ledger_folder)
+    given_daemon.handle(["month", "5", "2023"])
+    given_daemon.handle(["month", "6", "2023"])
+    ledger = given_daemon.state["LEDGER"]
+    may, june = ledger.get_month(5, 2023), ledger.get_month(6, 2023)
+
+    # When one of the month files is edited on disk
+    (given_ledger_folder / "2023-6.txt").write_text("1. Project1 8:00 - 12:00\n")
+    response = given_daemon.handle(["day", "1", "6", "2023"])
+
+    # Then the edit is shown
+    assert "12:00" in response["stdout"]
+
+    # And only the edited month is reloaded
+    assert ledger.get_month(5, 2023) is may
+    assert ledger.get_month(6, 2023) is not june
+
+
+def test_daemon_reopens_ledger_after_dry_run(given_ledger_folder: Path):
+    # Given a daemon
+    given_daemon = LedgerDaemon(given_ledger_folder)
+
+    # When adding a comment as a dry run
+    given_daemon.handle(["comment", "Hello", "1", "6", "2023", "--dry-run"])
+
+    # Then the resident ledger is unaffected
+    response = given_daemon.handle(["day", "1", "6", "2023", "-c"])
+    assert "Hello" not in response["stdout"]
@@ -6,6 +6,8 @@ from heath.shift import Shift
 from heath.project import Project
 from heath.exceptions import DayError, DayInconsistencyError
 
+from tests.utilities import given_completed_shift_for_project_between_times
+
 
 def test_day_must_be_initialized_with_date():
     # When initialing day without a date
@@ -185,3 +187,76 @@ def test_project_durations_sum_completed_shifts_per_project():
     # And the projects have the expected durations
     assert project_durations[given_project_a.key] == datetime.timedelta(hours=2)
     assert project_durations[given_project_b.key] == datetime.timedelta(hours=1)
+
+
+def test_day_totals_follow_changes_to_its_shifts():
+    # Given a day with a completed shift and a started shift
+    given_date = datetime.date(2023, 9, 5)
+    given_day = Day(given_date)
+    given_day.add_shift(
+        given_completed_shift_for_project_between_times(
+            Project("A"),
+            datetime.datetime(2023, 9, 5, 8),
+            datetime.datetime(2023, 9, 5, 12),
+        )
+    )
+    given_shift = Shift(Project("B"), given_date)
+    given_shift.start(datetime.datetime(2023, 9, 5, 13))
+    given_day.add_shift(given_shift)
+
+    # Then the totals only count the completed shift
+    assert not given_day.completed
+    assert given_day.worked_hours == datetime.timedelta(hours=4)
+    assert given_day.project_durations() == {"A": datetime.timedelta(hours=4)}
+
+    # And the started shift is counted against a given time
+    read_time = datetime.datetime(2023, 9, 5, 14)
+    assert given_day.duration_at(read_time) == datetime.timedelta(hours=5)
+    assert given_day.project_durations(True, read_time)["B"] == datetime.timedelta(
+        hours=1
+    )
+
+    # When the shift has lunch and is stopped
+    given_shift.lunch(datetime.timedelta(minutes=30))
+    given_shift.stop(datetime.datetime(2023, 9, 5, 17))
+
+    # Then the totals are updated
+    assert given_day.completed
+    assert given_day.lunch == datetime.timedelta(minutes=30)
+    assert given_day.worked_hours == datetime.timedelta(hours=7, minutes=30)
+    assert [project.key for project in given_day.projects] == ["A", "B"]
+
+
+def test_shifts_can_be_added_out_of_order_but_not_overlapping():
+    # Given a day with shifts added out of order
+    given_project = Project("AnyProject")
+    given_day = Day(datetime.date(2021, 12, 10))
+    for start_hour, stop_hour in ((13, 15), (8, 9), (17, 18), (10, 12)):
+        given_day.add_shift(
+            given_completed_shift_for_project_between_times(
+                given_project,
+                datetime.datetime(2021, 12, 10, start_hour),
+                datetime.datetime(2021, 12, 10, stop_hour),
+            )
+        )
+
+    # Then the shifts are sorted by start
+    assert [shift.start_time.hour for shift in given_day.shifts] == [8, 10, 13, 17]
+    assert given_day.worked_hours == datetime.timedelta(hours=6)
+
+    # And the day starts with the earliest shift and stops with the latest
+    assert given_day.start_time == datetime.datetime(2021, 12, 10, 8)
+    assert given_day.stop_time == datetime.datetime(2021, 12, 10, 18)
+    assert str(given_day).startswith("10. AnyProject 8:00 - 9:00; AnyProject 10:00")
+
+    # When adding shifts overlapping the earlier or later neighbour
+    # Then the shifts raise
+    for start_hour, stop_hour in ((11, 12), (14, 16), (7, 19)):
+        with pytest.raises(DayInconsistencyError):
+            given_day.add_shift(
+                given_completed_shift_for_project_between_times(
+                    given_project,
+                    datetime.datetime(2021, 12, 10, start_hour),
+                    datetime.datetime(2021, 12, 10, stop_hour),
+                )
+            )
@@ -0,0 +1,63 @@
+from datetime import date
+
+from heath.day import Day
+from heath.day_index import DayIndex, DayView
+
+
+def test_day_view_behaves_like_a_slice_of_the_days():
+    # Given a list of days
+    given_days = [Day(date(2023, 5, day_number)) for day_number in range(1, 11)]
+
+    # When viewing a part of the days
+    view = DayView(given_days, 2, 7)
+
+    # Then the view behaves like the corresponding slice
+    expected_days = given_days[2:7]
+    assert len(view) == len(expected_days)
+    assert list(view) == expected_days
+    assert list(reversed(view)) == expected_days[::-1]
+    assert view[0] is expected_days[0]
+    assert view[-1] is expected_days[-1]
+    assert list(view[1:-1]) == expected_days[1:-1]
+    assert view[::2] == expected_days[::2]
+    assert given_days[6] in view
+    assert given_days[7] not in view
+
+
+def test_day_index_views_days_in_date_range():
+    # Given a day index with days inserted out of order
+    given_index = DayIndex()
+    given_index.insert(Day(date(2023, 5, day_number)) for day_number in (8, 9, 10))
+    given_index.insert(Day(date(2023, 5, day_number)) for day_number in (1, 2, 5))
+
+    # When viewing a date range
+    view = given_index.view(date(2023, 5, 2), date(2023, 5, 8))
+
+    # Then the days in range are viewed in date order
+    assert [day.date.day for day in view] == [2, 5, 8]
+
+    # When removing a date range
+    given_index.remove(date(2023, 5, 1), date(2023, 5, 5))
+
+    # Then only the remaining days are left
+    assert len(given_index) == 3
+    assert not given_index.view(date(2023, 5, 1), date(2023, 5, 7))
+
+
+def test_day_index_ranges_follow_inserted_and_removed_days():
+    # Given a range of a day index
+    given_index = DayIndex()
+    given_index.insert(Day(date(2023, 5, day_number)) for day_number in (8, 9, 10))
+    day_range = given_index.range(date(2023, 5, 9), date(2023, 5, 31))
+    assert [day.date.day for day in day_range] == [9, 10]
+
+    # When inserting days before and in the range
+    given_index.insert(Day(date(2023, 5, day_number)) for day_number in (1, 2, 12))
+
+    # Then the range still has the days between its dates
+    assert [day.date.day for day in day_range] == [9, 10, 12]
+    assert given_index._days[slice(*day_range.positions)] == list(day_range)
+
+    # And so after removing days
+    given_index.remove(date(2023, 5, 1), date(2023, 5, 9))
+    assert [day.date.day for day in day_range] == [10, 12]
@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from heath.folder import LedgerFolder
+from heath.folder import LedgerFolder, MonthFile
 
 
 def test_non_existing_folder_is_not_valid(tmp_path: Path):
@@ -190,5 +190,46 @@ def test_year_file_can_be_read(tmp_path: Path):
     assert ledger_folder.years[0].year == given_year
 
 
+@pytest.mark.parametrize(
+    "given_content, expected_last_line",
+    [
+        ("", ""),
+        ("1. Project 9:00 - 17:00\n", "1. Project 9:00 - 17:00"),
+        ("1. Projekt 9:00 - 17:00\n2. Åkeri 8:00 -\n\n\n", "2. Åkeri 8:00 -"),
+        ("\n".join(f"{n}. Project 9:00 - 17:00" for n in range(1, 200)), "199. "),
+    ],
+)
+def test_last_line_of_month_file_is_read_from_the_end(
+    tmp_path: Path, given_content: str, expected_last_line: str
+):
+    # Given a month file
+    given_month_file = MonthFile(tmp_path / "2023-5.txt")
+    given_month_file.write(given_content)
+
+    # When reading the last line
+    offset, last_line = given_month_file.last_line()
+
+    # Then the last non blank line is returned
+    assert last_line.startswith(expected_last_line)
+
+    # And the offset is where the line starts in the file
+    assert given_month_file.path.read_bytes()[offset:].decode().strip() == last_line
+
+
+def test_month_file_can_be_rewritten_from_an_offset(tmp_path: Path):
+    # Given a month file with two lines
+    given_month_file = MonthFile(tmp_path / "2023-5.txt")
+    given_month_file.write("1. Åkeri 9:00 - 17:00\n2. Project 8:00 -\n")
+
+    # When rewriting the file from the start of the last line
+    offset, _ = given_month_file.last_line()
+    given_month_file.write_from(offset, "2. Project 8:00 - 16:00\n")
+
+    # Then only the last line is changed
+    assert given_month_file.content == (
+        "1. Åkeri 9:00 - 17:00\n2. Project 8:00 - 16:00\n"
+    )
+
+
 #    # Given all day projects
 #    given_all_days_projects = {"Vacation": "Good times", "SickLeave": "Bad times"}
@@ -1,5 +1,125 @@
+import datetime
+from pathlib import Path
+
 from src.heath import __version__
+from heath.day import Day
+from heath.folder import LedgerFolder
+from heath.heath import _patch_last_day, _write_month_to_disk
+from heath.ledger import Ledger
+
+from tests.utilities import (
+    given_completed_shift_for_project_between_times,
+    given_ledger_with_projects,
+)
 
 
 def test_version():
     assert __version__ == "0.1.12"
+
+
+def given_ledger_and_folder(
+    tmp_path: Path, month_content: str
+) -> tuple[Ledger, LedgerFolder]:
+    # A ledger of September 2023 with the given days, and a folder where the
+    # month file has the given content. The blank line of the file is only
+    # kept if the file is patched rather than written in full.
+    given_ledger = given_ledger_with_projects()
+    given_ledger.parse_month(2023, 9, "1. P1 8:00 - 16:00\n4. P1 8:00 - 12:00\n")
+    (tmp_path / "2023-9.txt").write_text(month_content)
+    return given_ledger, LedgerFolder(tmp_path)
+
+
+def given_shift_on_date(ledger: Ledger, date: datetime.date, start: int, stop: int):
+    return given_completed_shift_for_project_between_times(
+        ledger.get_project("P1"),
+        datetime.datetime.combine(date, datetime.time(start)),
+        datetime.datetime.combine(date, datetime.time(stop)),
+    )
+
+
+def test_editing_the_last_day_rewrites_only_the_last_line(tmp_path: Path):
+    # Given a month file of a month
+    ledger, folder = given_ledger_and_folder(
+        tmp_path, "1. P1 8:00 - 16:00\n\n4. P1 8:00 - 12:00\n"
+    )
+    month = ledger.get_month(9, 2023)
+
+    # When a shift is added to the last day and the month is written
+    month.last_day.add_shift(given_shift_on_date(ledger, month.last_day.date, 13, 16))
+    _write_month_to_disk(ledger, folder, 2023, 9, month.last_day)
+
+    # Then only the last line is changed
+    assert (tmp_path / "2023-9.txt").read_text() == (
+        "1. P1 8:00 - 16:00\n\n4. P1 8:00 - 12:00; P1 13:00 - 16:00\n"
+    )
+
+
+def test_starting_a_new_day_appends_a_line(tmp_path: Path):
+    # Given a month file of a month
+    ledger, folder = given_ledger_and_folder(
+        tmp_path, "1. P1 8:00 - 16:00\n\n4. P1 8:00 - 12:00"
+    )
+
+    # When a new last day is added and the month is written
+    new_day = Day(datetime.date(2023, 9, 5))
+    new_day.add_shift(given_shift_on_date(ledger, new_day.date, 8, 16))
+    ledger.add_day(new_day)
+    _write_month_to_disk(ledger, folder, 2023, 9, new_day)
+
+    # Then a line is appended for the day
+    assert (tmp_path / "2023-9.txt").read_text() == (
+        "1. P1 8:00 - 16:00\n\n4. P1 8:00 - 12:00\n5. P1 8:00 - 16:00\n"
+    )
+
+
+def test_a_month_file_that_does_not_match_the_month_is_written_in_full(
+    tmp_path: Path,
+):
+    # Given a month file whose last line is not the previous day of the month
+    ledger, folder = given_ledger_and_folder(
+        tmp_path, "1. P1 8:00 - 16:00\n\n4. P1 9:00 - 12:00\n"
+    )
+    month = ledger.get_month(9, 2023)
+    new_day = Day(datetime.date(2023, 9, 5))
+    new_day.add_shift(given_shift_on_date(ledger, new_day.date, 8, 16))
+    ledger.add_day(new_day)
+
+    # Then the last day can not be patched
+    assert not _patch_last_day(month, folder.months["2023-09"])
+
+    # When the month is written
+    _write_month_to_disk(ledger, folder, 2023, 9, new_day)
+
+    # Then the whole month is written
+    assert (tmp_path / "2023-9.txt").read_text() == month.serialize()
+
+
+def test_the_first_day_of_an_empty_month_file_is_written(tmp_path: Path):
+    # Given an empty month file of a month with one day
+    given_ledger = given_ledger_with_projects()
+    given_ledger.parse_month(2023, 9, "1. P1 8:00 - 12:00\n")
+    (tmp_path / "2023-9.txt").write_text("\n")
+    folder = LedgerFolder(tmp_path)
+    month = given_ledger.get_month(9, 2023)
+
+    # When the month is written
+    _write_month_to_disk(given_ledger, folder, 2023, 9, month.last_day)
+
+    # Then the file has the day
+    assert (tmp_path / "2023-9.txt").read_text() == "1. P1 8:00 - 12:00\n"
+
+
+def test_a_new_month_is_written_to_a_new_month_file(tmp_path: Path):
+    # Given a folder with the month file of September and a day in October
+    ledger, folder = given_ledger_and_folder(
+        tmp_path, "1. P1 8:00 - 16:00\n4. P1 8:00 - 12:00\n"
+    )
+    new_day = Day(datetime.date(2023, 10, 2))
+    new_day.add_shift(given_shift_on_date(ledger, new_day.date, 8, 16))
+    ledger.add_day(new_day)
+
+    # When the month is written
+    _write_month_to_disk(ledger, folder, 2023, 10, new_day)
+
+    # Then the month is written to the next month file
+    assert (tmp_path / "2023-10.txt").read_text() == "2. P1 8:00 - 16:00\n"
@@ -1,10 +1,16 @@
 from datetime import date, datetime, time, timedelta
+import random
 from textwrap import dedent
 
 import pytest
 
 from heath import exceptions
-from heath.ledger import Ledger
+from heath.ledger import (
+    Ledger,
+    parse_day_string,
+    parse_day_string_with_regex,
+    parse_month_strings,
+)
 from heath.month import Month
 from heath.project import Project
 
@@ -994,6 +1000,327 @@ def test_subsequent_months_can_not_start_in_the_middle_of_a_month():
         given_ledger.add_day(given_day)
 
 
+def test_registered_months_are_parsed_first_when_needed():
+    # Given a ledger with a project
+    given_ledger = Ledger()
+    given_ledger.add_project(Project("Project1"))
+
+    # Given three registered months which record when they are parsed
+    parsed_months = []
+
+    def given_loader(year, month):
+        def loader():
+            parsed_months.append((year, month))
+            given_ledger.parse_month(year, month, "1. Project1 9:00 - 17:00")
+
+        return loader
+
+    for month in (1, 2, 3):
+        given_ledger.register_month(2023, month, given_loader(2023, month))
+
+    # Then no month is parsed when registered
+    assert parsed_months == []
+
+    # When getting the first month
+    first_month = given_ledger.get_month(1, 2023)
+
+    # Then only that month is parsed
+    assert parsed_months == [(2023, 1)]
+    assert first_month.get_day(1).worked_hours == timedelta(hours=8)
+
+    # And getting the current month only parses the last month
+    assert given_ledger.current_month.month == 3
+    assert parsed_months == [(2023, 1), (2023, 3)]
+
+    # And listing all months parses the remaining month in order
+    assert [month.month for month in given_ledger.months] == [1, 2, 3]
+    assert parsed_months == [(2023, 1), (2023, 3), (2023, 2)]
+
+
+def test_time_periods_only_parse_registered_months_in_range():
+    # Given a ledger with a project
+    given_ledger = Ledger()
+    given_ledger.add_project(Project("Project1"))
+
+    # Given two registered months in different years
+    parsed_months = []
+
+    def given_loader(year, month):
+        def loader():
+            parsed_months.append((year, month))
+            given_ledger.parse_month(year, month, "2. Project1 9:00 - 17:00")
+
+        return loader
+
+    given_ledger.register_month(2022, 12, given_loader(2022, 12))
+    given_ledger.register_month(2023, 1, given_loader(2023, 1))
+
+    # When getting the last year
+    year_period = given_ledger.get_year(2023)
+
+    # Then only the month in that year is parsed
+    assert parsed_months == [(2023, 1)]
+    assert year_period.worked_hours == timedelta(hours=8)
+
+
+def test_first_registered_month_can_start_in_the_middle_of_a_month():
+    # Given a ledger with a project
+    given_ledger = Ledger()
+    given_ledger.add_project(Project("Project1"))
+
+    # Given two registered months where the first starts late
+    given_ledger.register_month(
+        2023,
+        8,
+        lambda: given_ledger.parse_month(2023, 8, "31. Project1 9:00 - 17:00"),
+    )
+    given_ledger.register_month(
+        2023,
+        9,
+        lambda: given_ledger.parse_month(2023, 9, "1. Project1 9:00 - 17:00"),
+    )
+
+    # When the last month is parsed before the first month
+    assert given_ledger.current_month.month == 9
+
+    # Then the first month is still allowed to start late
+    assert given_ledger.get_month(8, 2023).days[0].date == date(2023, 8, 31)
+
+
+def test_months_are_ordered_and_indexed_when_added_out_of_order():
+    # Given a ledger with months added out of order
+    given_ledger = Ledger()
+    for year, month in ((2023, 3), (2022, 12), (2023, 1), (2023, 2)):
+        given_ledger.add_month(Month(year, month))
+
+    # When forgetting one of the months
+    given_ledger.forget_month(2023, 1)
+
+    # Then the remaining months are in order
+    assert [(m.year, m.month) for m in given_ledger.months] == [
+        (2022, 12),
+        (2023, 2),
+        (2023, 3),
+    ]
+
+    # And each month can be found, except the forgotten one
+    assert given_ledger.get_month(12, 2022).month == 12
+    assert given_ledger.get_month(3, 2023).month == 3
+    assert given_ledger.get_month(1, 2023) is None
+
+
+def test_time_periods_contain_the_days_in_range_in_date_order():
+    # Given a ledger with a project and a non working date
+    given_ledger = Ledger()
+    given_ledger.add_project(Project("Project1"))
+    given_ledger.parse_year(2024, "2024-01-01: New year's day")
+
+    # Given two months parsed out of order
+    given_ledger.parse_month(
+        2024, 1, "2. Project1 9:00 - 17:00\n3. Project1 9:00 - 17:00"
+    )
+    given_ledger.parse_month(2023, 12, "29. Project1 9:00 - 17:00")
+
+    # When getting a week, a year and a custom period
+    week = given_ledger.get_week(1, 2024)
+    year = given_ledger.get_year(2023)
+    period = given_ledger.get_custom_time_period(date(2023, 12, 29), date(2024, 1, 2))
+
+    # Then the week is the ISO week, including the non working day
+    assert (week.first_date, week.last_date) == (date(2024, 1, 1), date(2024, 1, 7))
+    assert [day.date.day for day in week.all_days] == [1, 2, 3]
+
+    # And each period only contains the days in range
+    assert [day.date.day for day in year.days] == [29]
+    assert [day.date.day for day in period.days] == [29, 2]
+
+    # And forgotten months are no longer part of any period
+    given_ledger.forget_month(2024, 1)
+    assert not given_ledger.get_week(1, 2024).all_days
+
+
+def test_week_that_does_not_exist_raises():
+    # Given a ledger
+    given_ledger = Ledger()
+
+    # When getting week 53 of a year with 52 weeks
+    # Then an exception is raised
+    with pytest.raises(exceptions.DateInconsistencyError):
+        given_ledger.get_week(53, 2025)
+
+
+def test_ledger_gives_projects_dense_ids():
+    # Given a ledger with projects
+    given_ledger = Ledger()
+    given_ledger.parse_projects("[A]\nAllDay: False\n[B]\nAllDay: True\n")
+
+    # Then the projects have dense ids in the order they were added
+    assert [project.id for project in given_ledger.projects_by_id] == [0, 1]
+    assert [project.key for project in given_ledger.projects_by_id] == ["A", "B"]
+
+    # When adding an equal project
+    project_a = given_ledger.get_project("A")
+    added_project = given_ledger.add_project(Project("A"))
+
+    # Then the registered project is kept
+    assert added_project is project_a
+    assert given_ledger.get_project("A") is project_a
+
+    # When adding a changed project with a known key, and a new project
+    changed_project = given_ledger.add_project(Project("A", "Project A"))
+    new_project = given_ledger.add_project(Project("C"))
+
+    # Then the changed project replaces the known one and keeps its id
+    assert changed_project.id == 0
+    assert given_ledger.get_project("A") is changed_project
+    assert new_project.id == 2
+    assert len(given_ledger.projects_by_id) == 3
+
+    # And another ledger gives its projects their own ids
+    other_ledger = Ledger()
+    assert other_ledger.add_project(Project("C")).id == 0
+
+
+def test_time_periods_keep_their_days_when_earlier_months_are_loaded():
+    # Given a ledger with registered months that are loaded when needed
+    given_ledger = utilities.given_ledger_with_projects()
+    for month in (1, 2, 3):
+        month_string = utilities.given_month_string(given_ledger, 2023, month)
+        given_ledger.register_month(
+            2023,
+            month,
+            lambda month=month, month_string=month_string: given_ledger.parse_month(
+                2023, month, month_string
+            ),
+        )
+
+    # Given a time period of the last month
+    march = given_ledger.get_custom_time_period(date(2023, 3, 1), date(2023, 3, 31))
+    march_days = list(march.days)
+    worked_hours = march.worked_hours
+
+    # When the earlier months are loaded by another time period
+    given_ledger.get_year(2023)
+
+    # Then the time period still has its own days and totals
+    assert list(march.days) == march_days
+    assert {day.date.month for day in march.all_days} == {3}
+    assert march.worked_hours == worked_hours
+
+
+@pytest.mark.parametrize(
+    "given_today, expected_title",
+    ((date(2027, 1, 1), "Vecka 53, 2026"), (date(2024, 12, 30), "Vecka 1, 2025")),
+)
+def test_current_week_is_the_iso_week_of_today(
+    monkeypatch, given_today, expected_title
+):
+    # Given a ledger and a today in a week that belongs to another year
+    given_ledger = Ledger()
+
+    class Today(date):
+        @classmethod
+        def today(cls):
+            return given_today
+
+    monkeypatch.setattr("heath.ledger.datetime.date", Today)
+
+    # When getting the current week
+    week = given_ledger.current_week
+
+    # Then it is the ISO week of today
+    assert week.title == expected_title
+
+
+def test_month_strings_parsed_in_parallel_equals_serial_parsing():
+    # Given a number of month strings
+    given_month_strings = [dedent(EXAMPLE_MONTH)] * 6
+
+    # When parsing the month strings serially and in parallel
+    serial_records = parse_month_strings(given_month_strings)
+    parallel_records = parse_month_strings(given_month_strings, workers=2, threshold=2)
+
+    # Then the results are identical and in the same order
+    assert parallel_records == serial_records
+    assert len(parallel_records) == len(given_month_strings)
+
+
+@pytest.mark.parametrize("given_seed", range(5))
+def test_tokenizer_and_regex_parser_agree_on_generated_day_strings(given_seed):
+    # Given generated day strings, both well formed and malformed
+    rng = random.Random(given_seed)
+    given_day_strings = [given_generated_day_string(rng) for _ in range(1000)]
+
+    for day_string in given_day_strings:
+        # When parsing the day string with the tokenizer and the regex parser
+        tokenized = parse_or_exception(parse_day_string, day_string)
+        reference = parse_or_exception(parse_day_string_with_regex, day_string)
+
+        # Then both gives the same day record (from which identical days are built)
+        assert tokenized == reference, day_string
+
+
+def parse_or_exception(parser, day_string):
+    try:
+        return parser(day_string)
+    except ValueError as e:
+        return type(e)
+
+
+def given_generated_day_string(rng: random.Random) -> str:
+    def space():
+        return rng.choice(("", " ", " ", "  ", "\t"))
+
+    def clock():
+        return f"{rng.choice((0, 8, 9, 12, 17, 23, 24))}:{rng.choice(('00', '05', '30', '59', '60'))}"
+
+    def junk():
+        return rng.choice((",", " x", "-", ":", " 7:00", ":00", "_", " ,", "#", "."))
+
+    shift_strings = []
+    for _ in range(rng.randint(0, 4)):
+        shift_string = rng.choice(("Project1", "P_2", "ACME", "17", "Åkeri"))
+        if rng.random() < 0.8:
+            shift_string += rng.choice((" ", "  ", "\t")) + clock()
+            if rng.random() < 0.7:
+                shift_string += space() + "-" + space()
+                shift_string += clock() if rng.random() < 0.9 else ""
+            if rng.random() < 0.5:
+                shift_string += space() + "," + space()
+                shift_string += rng.choice(("Lunch", "lunch", "LUNCH", "Lunchbox"))
+                shift_string += space() + rng.choice(("0:30", "1:00", "0:45", ""))
+        if rng.random() < 0.1:
+            shift_string += junk()
+        shift_strings.append(shift_string)
+
+    day_string = rng.choice(("", "", "", " ", "x")) + f"{rng.randint(1, 28)}."
+    day_string += space() + (";" + space()).join(shift_strings) + space()
+    if rng.random() < 0.2:
+        day_string += rng.choice(("# Comment", " #  Comment  ", "#"))
+    return day_string
+
+
+def test_streamed_month_yields_the_same_days_as_parsed_month():
+    # Given a ledger with the projects of the example month
+    given_ledger = Ledger()
+    for project_key in ("Project1", "Project2", "Project3"):
+        given_ledger.add_project(Project(project_key))
+    for project_key in ("Vacation", "SickLeave"):
+        given_ledger.add_project(Project(project_key, all_day=True))
+
+    # Given the example month as lines, like from a file handle
+    given_month_lines = dedent(EXAMPLE_MONTH).splitlines(keepends=True)
+
+    # When streaming the days of the month
+    streamed_days = given_ledger.stream_month(2022, 2, iter(given_month_lines))
+
+    # Then the streamed days equals the days of the parsed month
+    given_ledger.parse_month(2022, 2, dedent(EXAMPLE_MONTH))
+    assert [str(day) for day in streamed_days] == [
+        str(day) for day in given_ledger.current_month.days
+    ]
+
+
 # def test_bad_month_file_raises()
 # def test_bad_year_file_raises()
 # def test_bad_project_file_raises()
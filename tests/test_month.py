@@ -297,6 +297,42 @@ def test_month_can_be_given_non_working_dates():
     assert new_next_date in added_dates
 
 
+def test_all_days_are_merged_once_until_month_changes():
+    # Given a month with a non working date between two days
+    given_month = Month(2022, 1)
+    given_month.add_day(given_completed_day_for_date(datetime.date(2022, 1, 3)))
+    given_month.add_non_working_date(datetime.date(2022, 1, 4), "Holiday")
+    given_month.add_day(given_completed_day_for_date(datetime.date(2022, 1, 5)))
+
+    # When making reports of the month
+    given_month.report()
+    given_month.report(by_project=True)
+
+    # Then all days are merged once, in date order
+    assert given_month.all_days_merges == 1
+    assert [day.date.day for day in given_month.all_days] == [3, 4, 5]
+
+    # When adding another day
+    given_month.add_day(given_completed_day_for_date(datetime.date(2022, 1, 6)))
+
+    # Then all days are merged again
+    assert [day.date.day for day in given_month.all_days] == [3, 4, 5, 6]
+    assert given_month.all_days_merges == 2
+
+
+def test_month_knows_its_work_days():
+    # Given a month with a non working date
+    given_month = Month(2022, 2)
+    given_month.add_non_working_date(datetime.date(2022, 2, 1))
+
+    # When getting the work days of the month
+    work_day_numbers = given_month.work_day_numbers
+
+    # Then weekends and the non working date are excluded
+    assert work_day_numbers[:5] == [2, 3, 4, 7, 8]
+    assert len(work_day_numbers) == 19
+
+
 def test_it_is_possible_to_get_a_non_working_day_by_date():
     # Given a month
     given_month = Month(2022, 12)
@@ -0,0 +1,105 @@
+import datetime
+
+from heath.day import Day
+from heath.pivot import ProjectPivot
+from heath.project import Project
+from heath.shift import Shift
+
+from tests.utilities import (
+    given_all_day_project_on_date,
+    given_completed_shift_for_project_between_times,
+)
+
+
+def given_days() -> list[Day]:
+    # A day with shifts for two projects, an all day project and an open day.
+    given_project_a = Project("A")
+    given_project_b = Project("B")
+    day_1 = Day(datetime.date(2023, 9, 4))
+    for project, start_hour, stop_hour in (
+        (given_project_b, 8, 10),
+        (given_project_a, 10, 12),
+        (given_project_b, 13, 17),
+    ):
+        day_1.add_shift(
+            given_completed_shift_for_project_between_times(
+                project,
+                datetime.datetime(2023, 9, 4, start_hour),
+                datetime.datetime(2023, 9, 4, stop_hour),
+            )
+        )
+    day_2 = given_all_day_project_on_date(
+        datetime.date(2023, 9, 5), Project("Vacation", all_day=True)
+    )
+    day_3 = Day(datetime.date(2023, 9, 6))
+    day_3.add_shift(
+        given_completed_shift_for_project_between_times(
+            given_project_a,
+            datetime.datetime(2023, 9, 6, 8),
+            datetime.datetime(2023, 9, 6, 12),
+        )
+    )
+    open_shift = Shift(Project("C"), day_3.date)
+    open_shift.start(datetime.datetime(2023, 9, 6, 13))
+    day_3.add_shift(open_shift)
+    return [day_1, day_2, day_3]
+
+
+def test_pivot_rows_match_the_project_durations_of_days():
+    # Given days with completed, all day and open shifts
+    days = given_days()
+    read_time = datetime.datetime(2023, 9, 6, 15)
+
+    # When pivoting the days, with and without open shifts
+    pivot = ProjectPivot(days)
+    active_pivot = ProjectPivot(days, read_time)
+
+    # Then there is a row per day
+    assert pivot.dates == [day.date for day in days]
+
+    # And the rows have the projects of each day in the same order as the days
+    assert [list(row.items()) for row in pivot.rows()] == [
+        list(day.project_durations().items()) for day in days
+    ]
+    assert [list(row.items()) for row in active_pivot.rows()] == [
+        list(day.project_durations(True, read_time).items()) for day in days
+    ]
+    assert active_pivot.row(2)["C"] == datetime.timedelta(hours=2)
+
+    # And the row totals match those of the days
+    assert [pivot.row_totals(row) for row in range(len(pivot))] == [
+        day.report_data_by_project() for day in days
+    ]
+
+
+def test_pivot_rows_have_projects_in_the_order_they_first_appear_in_the_days():
+    # Given a day with project A and a day with project B before A
+    given_project_a = Project("A")
+    given_project_b = Project("B")
+    day_1 = Day(datetime.date(2023, 9, 4))
+    day_1.add_shift(
+        given_completed_shift_for_project_between_times(
+            given_project_a,
+            datetime.datetime(2023, 9, 4, 8),
+            datetime.datetime(2023, 9, 4, 12),
+        )
+    )
+    day_2 = Day(datetime.date(2023, 9, 5))
+    for project, start_hour, stop_hour in (
+        (given_project_b, 8, 10),
+        (given_project_a, 10, 12),
+    ):
+        day_2.add_shift(
+            given_completed_shift_for_project_between_times(
+                project,
+                datetime.datetime(2023, 9, 5, start_hour),
+                datetime.datetime(2023, 9, 5, stop_hour),
+            )
+        )
+
+    # When pivoting the days
+    pivot = ProjectPivot([day_1, day_2])
+
+    # Then the projects of the second day are in the order of the first
+    assert list(pivot.row(1)) == ["A", "B"]
+    assert list(pivot.by_project()) == ["A", "B"]
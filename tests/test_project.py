@@ -1,3 +1,5 @@
+import copy
+import pickle
 from textwrap import dedent
 
 import pytest
@@ -32,6 +34,19 @@ def test_projects_with_same_values_are_equal(
     assert are_equal
 
 
+def test_projects_can_be_copied_and_pickled():
+    # Given a project
+    given_project = Project("A", "Project A", "P-A", True)
+
+    # When copying and pickling the project
+    copied_project = copy.copy(given_project)
+    unpickled_project = pickle.loads(pickle.dumps(given_project))
+
+    # Then the copies equal the project
+    assert copied_project == given_project
+    assert unpickled_project == given_project
+
+
 @pytest.mark.parametrize(
     "given_configuration, expected_project_values",
     (
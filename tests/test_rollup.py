@@ -0,0 +1,110 @@
+from datetime import date, datetime, time
+
+from heath.ledger import Ledger
+from heath.rollup import MonthRollup
+from heath.shift import Shift
+
+from tests.utilities import given_ledger_with_projects, given_month_string
+
+
+def given_ledger(rollups: dict) -> Ledger:
+    given_ledger = given_ledger_with_projects(3)
+    for month in range(1, 4):
+        month_string = given_month_string(given_ledger, 2023, month, 3)
+        given_ledger.register_month(
+            2023,
+            month,
+            lambda month=month, month_string=month_string: given_ledger.parse_month(
+                2023, month, month_string
+            ),
+            lambda month=month: rollups.get(month),
+        )
+    return given_ledger
+
+
+def test_rollups_are_only_made_for_closed_months():
+    # Given a month
+    ledger = given_ledger({})
+    month = ledger.get_month(2, 2023)
+
+    # Then it only has a rollup when it is over
+    assert MonthRollup.from_month(month, today=date(2023, 2, 28)) is None
+    assert MonthRollup.from_month(month, today=date(2023, 3, 1)) is not None
+
+    # When a shift of the month is not stopped
+    last_day = month.days[-1]
+    shift = Shift(ledger.get_project("P2"), last_day.date)
+    shift.start(datetime.combine(last_day.date, time(17)))
+    last_day.add_shift(shift)
+
+    # Then the month has no rollup
+    assert MonthRollup.from_month(month, today=date(2023, 3, 1)) is None
+
+
+def test_time_periods_combine_rollups_of_whole_months_with_other_days():
+    # Given rollups of closed months
+    ledger = given_ledger({})
+    rollups = {
+        month: MonthRollup.from_dict(
+            MonthRollup.from_month(ledger.get_month(month, 2023)).to_dict()
+        )
+        for month in range(1, 4)
+    }
+
+    # Given a ledger with the rollups of its months
+    rolled_up_ledger = given_ledger(rollups)
+
+    # When getting a time period from the middle of a month
+    time_period = rolled_up_ledger.get_custom_time_period(
+        date(2023, 1, 15), date(2023, 3, 31)
+    )
+
+    # Then the whole months are not loaded
+    assert [month.month for month in rolled_up_ledger._months] == [1]
+    assert len(time_period._rollups) == 2
+
+    # And the rollups give the same aggregates as the days
+    expected = ledger.get_custom_time_period(date(2023, 1, 15), date(2023, 3, 31))
+    assert time_period.worked_hours == expected.worked_hours
+    assert time_period.balance == expected.balance
+    assert time_period.overview() == expected.overview()
+    assert time_period.statistics() == expected.statistics()
+    assert time_period.report(by_project_total=True) == expected.report(
+        by_project_total=True
+    )
+    assert [month.month for month in rolled_up_ledger._months] == [1]
+
+    # When the days of the time period are needed
+    report = time_period.report()
+
+    # Then the whole months are loaded
+    assert [month.month for month in rolled_up_ledger._months] == [1, 2, 3]
+    assert report == expected.report()
+    assert time_period._rollups == []
+
+
+def test_time_periods_do_not_count_rolled_up_months_twice_once_loaded():
+    # Given a time period of a ledger with the rollups of its months
+    ledger = given_ledger({})
+    rollups = {
+        month: MonthRollup.from_month(ledger.get_month(month, 2023))
+        for month in range(1, 4)
+    }
+    rolled_up_ledger = given_ledger(rollups)
+    time_period = rolled_up_ledger.get_custom_time_period(
+        date(2023, 1, 1), date(2023, 3, 31)
+    )
+    assert len(time_period._rollups) == 3
+
+    # When a rolled up month is loaded afterwards
+    rolled_up_ledger.get_month(2, 2023)
+
+    # Then its days are counted instead of its rollup
+    assert len(time_period._rollups) == 2
+    expected = ledger.get_custom_time_period(date(2023, 1, 1), date(2023, 3, 31))
+    assert time_period.worked_hours == expected.worked_hours
+    assert time_period.balance == expected.balance
+    assert time_period.statistics() == expected.statistics()
+    assert time_period.report(by_project_total=True) == expected.report(
+        by_project_total=True
+    )
@@ -0,0 +1,177 @@
+import datetime
+
+import pytest
+
+from heath.rounding import round_durations, round_matrix
+
+
+@pytest.mark.parametrize(
+    "given_durations, expected_durations",
+    (
+        ({}, {}),
+        (
+            {datetime.date(2023, 9, 6): datetime.timedelta(hours=8)},
+            {datetime.date(2023, 9, 6): datetime.timedelta(hours=8)},
+        ),
+        (
+            {
+                datetime.date(2023, 9, 6): datetime.timedelta(hours=8),
+                datetime.date(2023, 9, 7): datetime.timedelta(hours=8, minutes=30),
+            },
+            {
+                datetime.date(2023, 9, 6): datetime.timedelta(hours=8),
+                datetime.date(2023, 9, 7): datetime.timedelta(hours=8, minutes=30),
+            },
+        ),
+        (
+            # Round up biggest value even if it would round up on its own
+            {
+                datetime.date(2023, 9, 4): datetime.timedelta(hours=8, minutes=5),
+                datetime.date(2023, 9, 5): datetime.timedelta(hours=8, minutes=5),
+                datetime.date(2023, 9, 6): datetime.timedelta(hours=8, minutes=10),
+                datetime.date(2023, 9, 7): datetime.timedelta(hours=8, minutes=5),
+                datetime.date(2023, 9, 8): datetime.timedelta(hours=8, minutes=5),
+            },
+            {
+                datetime.date(2023, 9, 4): datetime.timedelta(hours=8),
+                datetime.date(2023, 9, 5): datetime.timedelta(hours=8),
+                datetime.date(2023, 9, 6): datetime.timedelta(hours=8, minutes=30),
+                datetime.date(2023, 9, 7): datetime.timedelta(hours=8),
+                datetime.date(2023, 9, 8): datetime.timedelta(hours=8),
+            },
+        ),
+        (
+            # Round up latest value even if earlier values have same remainder
+            {
+                datetime.date(2023, 9, 4): datetime.timedelta(hours=8, minutes=10),
+                datetime.date(2023, 9, 5): datetime.timedelta(hours=8, minutes=10),
+                datetime.date(2023, 9, 6): datetime.timedelta(hours=8, minutes=10),
+            },
+            {
+                datetime.date(2023, 9, 4): datetime.timedelta(hours=8),
+                datetime.date(2023, 9, 5): datetime.timedelta(hours=8),
+                datetime.date(2023, 9, 6): datetime.timedelta(hours=8, minutes=30),
+            },
+        ),
+        (
+            # *:15 and *:45 are handled equaly.
+            {
+                datetime.date(2023, 9, 4): datetime.timedelta(hours=7, minutes=45),
+                datetime.date(2023, 9, 5): datetime.timedelta(hours=8, minutes=15),
+                datetime.date(2023, 9, 6): datetime.timedelta(hours=7, minutes=45),
+                datetime.date(2023, 9, 7): datetime.timedelta(hours=8, minutes=15),
+            },
+            {
+                datetime.date(2023, 9, 4): datetime.timedelta(hours=7, minutes=30),
+                datetime.date(2023, 9, 5): datetime.timedelta(hours=8, minutes=00),
+                datetime.date(2023, 9, 6): datetime.timedelta(hours=8, minutes=00),
+                datetime.date(2023, 9, 7): datetime.timedelta(hours=8, minutes=30),
+            },
+        ),
+        (
+            # Smaller values might become zero.
+            {
+                datetime.date(2023, 9, 4): datetime.timedelta(hours=0, minutes=20),
+                datetime.date(2023, 9, 5): datetime.timedelta(hours=8, minutes=20),
+                datetime.date(2023, 9, 6): datetime.timedelta(hours=8, minutes=25),
+                datetime.date(2023, 9, 7): datetime.timedelta(hours=8, minutes=25),
+            },
+            {
+                datetime.date(2023, 9, 4): datetime.timedelta(),
+                datetime.date(2023, 9, 5): datetime.timedelta(hours=8, minutes=30),
+                datetime.date(2023, 9, 6): datetime.timedelta(hours=8, minutes=30),
+                datetime.date(2023, 9, 7): datetime.timedelta(hours=8, minutes=30),
+            },
+        ),
+    ),
+)
+def test_round_durations_keeps_a_total_of_whole_half_hours(
+    given_durations, expected_durations
+):
+    # Given durations
+    # When rounding the durations
+    rounded_durations = round_durations(given_durations)
+
+    # Then the result should have the same total duration as the input
+    assert sum(rounded_durations.values(), datetime.timedelta()) == sum(
+        given_durations.values(), datetime.timedelta()
+    )
+
+    # And the result should match the expexted durations
+    assert rounded_durations == expected_durations
+
+
+@pytest.mark.parametrize(
+    "given_durations, expected_durations",
+    (
+        (
+            # Single day, not even half hours
+            {datetime.date(2023, 9, 6): datetime.timedelta(hours=8, minutes=35)},
+            {datetime.date(2023, 9, 6): datetime.timedelta(hours=8, minutes=30)},
+        ),
+        (
+            # Multiple days, not even half hours
+            {
+                datetime.date(2023, 9, 6): datetime.timedelta(hours=8, minutes=20),
+                datetime.date(2023, 9, 7): datetime.timedelta(hours=8, minutes=20),
+            },
+            {
+                datetime.date(2023, 9, 6): datetime.timedelta(hours=8),
+                datetime.date(2023, 9, 7): datetime.timedelta(hours=8, minutes=30),
+            },
+        ),
+    ),
+)
+def test_round_durations_rounds_other_totals_to_nearest_half_hour(
+    given_durations, expected_durations
+):
+    # Given durations with a total that is not whole half hours
+    # When rounding the durations
+    rounded_durations = round_durations(given_durations)
+
+    # Then the total is rounded to the nearest half hour
+    assert rounded_durations == expected_durations
+
+
+def test_round_matrix_keeps_day_totals_and_total():
+    # Given durations per day and project, with all day projects as None
+    given_durations = [
+        {
+            "P1": datetime.timedelta(hours=3, minutes=10),
+            "P2": datetime.timedelta(hours=4, minutes=50),
+        },
+        {"Vacation": None},
+        {
+            "P1": datetime.timedelta(hours=2, minutes=20),
+            "P2": datetime.timedelta(hours=2, minutes=20),
+            "P3": datetime.timedelta(hours=3, minutes=5),
+        },
+        {
+            "P1": datetime.timedelta(minutes=50),
+            "P3": datetime.timedelta(hours=7, minutes=5),
+        },
+    ]
+
+    # When rounding the durations to quarters of an hour
+    rounded_durations = round_matrix(
+        given_durations, granularity=datetime.timedelta(minutes=15)
+    )
+
+    # Then day totals that are whole quarters are kept, others are rounded
+    # so that the total is kept to the nearest quarter
+    assert rounded_durations == [
+        {
+            "P1": datetime.timedelta(hours=3, minutes=15),
+            "P2": datetime.timedelta(hours=4, minutes=45),
+        },
+        {"Vacation": None},
+        {
+            "P1": datetime.timedelta(hours=2, minutes=15),
+            "P2": datetime.timedelta(hours=2, minutes=15),
+            "P3": datetime.timedelta(hours=3, minutes=15),
+        },
+        {
+            "P1": datetime.timedelta(minutes=45),
+            "P3": datetime.timedelta(hours=7, minutes=15),
+        },
+    ]
@@ -1,4 +1,6 @@
 from datetime import datetime, date, timedelta
+import os
+import tracemalloc
 
 import pytest
 
@@ -440,3 +442,78 @@ def test_all_day_shift_will_raise_if_started():
     # Then the shift raises
     with pytest.raises(ShiftError):
         given_shift.start(whenever)
+
+
+def test_shift_times_are_kept_without_instance_dict():
+    # Given a shift over midnight
+    given_date = date(2021, 12, 6)
+    given_shift = Shift(Project("ProjectX"), given_date)
+    given_start_time = datetime(2021, 12, 6, 22, 15, 30)
+    given_stop_time = datetime(2021, 12, 7, 1, 45)
+
+    # When starting, stopping and having lunch
+    given_shift.start(given_start_time)
+    given_shift.stop(given_stop_time)
+    given_shift.lunch(timedelta(minutes=30))
+
+    # Then the times are read back as given
+    assert given_shift.start_time == given_start_time
+    assert given_shift.stop_time == given_stop_time
+    assert given_shift.lunch_duration == timedelta(minutes=30)
+    assert given_shift.duration == timedelta(hours=2, minutes=59, seconds=30)
+
+    # And the shift has no instance dict
+    assert not hasattr(given_shift, "__dict__")
+
+
+class DictShift:
+    # The layout of shifts before their times were kept as seconds: an
+    # instance dict with datetimes and a timedelta.
+    def __init__(self, project: Project, date: date):
+        self.project = project
+        self.date = date
+        self.day = None
+        self.start_time = None
+        self.stop_time = None
+        self.lunch_duration = timedelta()
+
+    def start(self, start_time: datetime):
+        self.start_time = start_time
+
+    def stop(self, stop_time: datetime):
+        self.stop_time = stop_time
+
+    def lunch(self, lunch_duration: timedelta):
+        self.lunch_duration = lunch_duration
+
+
+def bytes_per_shift(shift_class, count: int) -> float:
+    project = Project("ProjectX")
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    shifts = []
+    for index in range(count):
+        shift_date = date(2021, 1, 1) + timedelta(days=index % 365)
+        shift = shift_class(project, shift_date)
+        shift.start(datetime.combine(shift_date, datetime.min.time()).replace(hour=8))
+        shift.stop(datetime.combine(shift_date, datetime.min.time()).replace(hour=17))
+        shift.lunch(timedelta(minutes=30 + index % 30))
+        shifts.append(shift)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+@pytest.mark.skipif(
+    "HEATH_BENCHMARK" not in os.environ,
+    reason="Memory benchmark, run with HEATH_BENCHMARK set.",
+)
+def test_memory_per_shift():
+    # Given many shifts with times kept as seconds, and as datetimes
+    count = 20_000
+    dict_shift_bytes = bytes_per_shift(DictShift, count)
+    shift_bytes = bytes_per_shift(Shift, count)
+    print(f"\nBytes per shift: {dict_shift_bytes:.0f} -> {shift_bytes:.0f}")
+
+    # Then shifts with seconds use less than half the memory
+    assert shift_bytes < dict_shift_bytes / 2
@@ -1,10 +1,14 @@
 import datetime
 
-import pytest
-
 from heath.day import Day
 from heath.project import Project
-from heath.time_period import TimePeriod, lossless_round
+from heath.shift import Shift
+from heath.time_period import (
+    TimePeriod,
+    durations_by_project,
+    total_balance,
+    total_worked_hours,
+)
 
 from tests.utilities import (
     given_completed_day_for_date,
@@ -95,125 +99,7 @@ def test_get_project_durations_for_time_period():
     )
 
 
-@pytest.mark.parametrize(
-    "given_durations, expected_durations",
-    (
-        ({}, {}),
-        (
-            {datetime.date(2023, 9, 6): datetime.timedelta(hours=8)},
-            {datetime.date(2023, 9, 6): datetime.timedelta(hours=8)},
-        ),
-        (
-            {
-                datetime.date(2023, 9, 6): datetime.timedelta(hours=8),
-                datetime.date(2023, 9, 7): datetime.timedelta(hours=8, minutes=30),
-            },
-            {
-                datetime.date(2023, 9, 6): datetime.timedelta(hours=8),
-                datetime.date(2023, 9, 7): datetime.timedelta(hours=8, minutes=30),
-            },
-        ),
-        (
-            # Round up biggest value even if it would round up on its own
-            {
-                datetime.date(2023, 9, 4): datetime.timedelta(hours=8, minutes=5),
-                datetime.date(2023, 9, 5): datetime.timedelta(hours=8, minutes=5),
-                datetime.date(2023, 9, 6): datetime.timedelta(hours=8, minutes=10),
-                datetime.date(2023, 9, 7): datetime.timedelta(hours=8, minutes=5),
-                datetime.date(2023, 9, 8): datetime.timedelta(hours=8, minutes=5),
-            },
-            {
-                datetime.date(2023, 9, 4): datetime.timedelta(hours=8),
-                datetime.date(2023, 9, 5): datetime.timedelta(hours=8),
-                datetime.date(2023, 9, 6): datetime.timedelta(hours=8, minutes=30),
-                datetime.date(2023, 9, 7): datetime.timedelta(hours=8),
-                datetime.date(2023, 9, 8): datetime.timedelta(hours=8),
-            },
-        ),
-        (
-            # Round up latest value even if earlier values have same remainder
-            {
-                datetime.date(2023, 9, 4): datetime.timedelta(hours=8, minutes=10),
-                datetime.date(2023, 9, 5): datetime.timedelta(hours=8, minutes=10),
-                datetime.date(2023, 9, 6): datetime.timedelta(hours=8, minutes=10),
-            },
-            {
-                datetime.date(2023, 9, 4): datetime.timedelta(hours=8),
-                datetime.date(2023, 9, 5): datetime.timedelta(hours=8),
-                datetime.date(2023, 9, 6): datetime.timedelta(hours=8, minutes=30),
-            },
-        ),
-        (
-            # *:15 and *:45 are handled equaly.
-            {
-                datetime.date(2023, 9, 4): datetime.timedelta(hours=7, minutes=45),
-                datetime.date(2023, 9, 5): datetime.timedelta(hours=8, minutes=15),
-                datetime.date(2023, 9, 6): datetime.timedelta(hours=7, minutes=45),
-                datetime.date(2023, 9, 7): datetime.timedelta(hours=8, minutes=15),
-            },
-            {
-                datetime.date(2023, 9, 4): datetime.timedelta(hours=7, minutes=30),
-                datetime.date(2023, 9, 5): datetime.timedelta(hours=8, minutes=00),
-                datetime.date(2023, 9, 6): datetime.timedelta(hours=8, minutes=00),
-                datetime.date(2023, 9, 7): datetime.timedelta(hours=8, minutes=30),
-            },
-        ),
-        (
-            # Smaller values might become zero.
-            {
-                datetime.date(2023, 9, 4): datetime.timedelta(hours=0, minutes=20),
-                datetime.date(2023, 9, 5): datetime.timedelta(hours=8, minutes=20),
-                datetime.date(2023, 9, 6): datetime.timedelta(hours=8, minutes=25),
-                datetime.date(2023, 9, 7): datetime.timedelta(hours=8, minutes=25),
-            },
-            {
-                datetime.date(2023, 9, 4): datetime.timedelta(),
-                datetime.date(2023, 9, 5): datetime.timedelta(hours=8, minutes=30),
-                datetime.date(2023, 9, 6): datetime.timedelta(hours=8, minutes=30),
-                datetime.date(2023, 9, 7): datetime.timedelta(hours=8, minutes=30),
-            },
-        ),
-    ),
-)
-def test_lossless_round_on_compliant_data(given_durations, expected_durations):
-    # Given durations
-    # When using lossless_round
-    rounded_durations = lossless_round(given_durations)
-
-    # Then the result should have the same total duration as the input
-    assert sum(rounded_durations.values(), datetime.timedelta()) == sum(
-        given_durations.values(), datetime.timedelta()
-    )
-
-    # And the result should match the expexted durations
-    assert rounded_durations == expected_durations
-
-
-@pytest.mark.parametrize(
-    "given_durations",
-    (
-        {
-            datetime.date(2023, 9, 6): datetime.timedelta(hours=8, minutes=35)
-        },  # Single day, not even half hours
-        {
-            datetime.date(2023, 9, 6): datetime.timedelta(
-                hours=8, minutes=20
-            ),  # Multiple days, not even half hours
-            datetime.date(2023, 9, 7): datetime.timedelta(hours=7, minutes=25),
-            datetime.date(2023, 9, 7): datetime.timedelta(hours=8, minutes=20),
-        },
-    ),
-)
-def test_lossless_round_on_non_compliant_data_returns_input_unchanged(given_durations):
-    # Given durations
-    # When using lossless_round
-    rounded_durations = lossless_round(given_durations)
-
-    # Then the input is returned
-    assert rounded_durations == given_durations
-
-
-def test_lossless_round_should_not_raise_on_all_day_projects():
+def test_rounding_should_not_raise_on_all_day_projects():
     # Given an all day project and a regular project
     given_all_day_project = Project("AllDayProject", all_day=True)
     given_regular_project = Project("RegularProject")
@@ -231,13 +117,44 @@ def test_lossless_round_should_not_raise_on_all_day_projects():
     # Given a time period with the two days
     given_time_period = SimpleTimePeriod([day_1, day_2])
 
-    # When requesting a report by project, using lossless round
+    # When requesting a report by project, with rounded durations
     report = given_time_period.report(by_project=True, round_project_durations=True)
 
     # Then the function should not raise and return something
     assert report
 
 
+def test_aggregates_can_be_folded_over_a_stream_of_days():
+    # Given a completed long day, an all day project, a short day and an open day
+    given_project = Project("Project")
+    given_all_day_project = Project("AllDayProject", all_day=True)
+    given_days = []
+    for day_number, start_hour, stop_hour in ((4, 8, 17), (6, 9, 15), (7, 8, None)):
+        given_day = Day(datetime.date(2023, 9, day_number))
+        given_shift = Shift(given_project, given_day.date)
+        given_shift.start(datetime.datetime(2023, 9, day_number, start_hour))
+        if stop_hour:
+            given_shift.stop(datetime.datetime(2023, 9, day_number, stop_hour))
+        given_day.add_shift(given_shift)
+        given_days.append(given_day)
+    given_days.insert(
+        1,
+        given_all_day_project_on_date(datetime.date(2023, 9, 5), given_all_day_project),
+    )
+    given_time_period = SimpleTimePeriod(given_days)
+    assert given_time_period.worked_hours == datetime.timedelta(hours=15)
+
+    # When folding the aggregates over streams (one use generators) of the days
+    # Then they equal the aggregates of the time period
+    assert total_worked_hours(day for day in given_days) == (
+        given_time_period.worked_hours
+    )
+    assert total_balance(day for day in given_days) == given_time_period.balance
+    assert durations_by_project(day for day in given_days) == (
+        given_time_period.project_durations()
+    )
+
+
 class SimpleTimePeriod(TimePeriod):
     def __init__(self, days: list):
         super().__init__()
@@ -0,0 +1,66 @@
+from datetime import date, timedelta
+
+import pytest
+
+from heath.exceptions import DateInconsistencyError
+from heath.work_calendar import WorkCalendar
+
+
+def test_work_calendar_skips_weekends_and_non_working_dates():
+    # Given a calendar with a non working date on a Friday
+    given_calendar = WorkCalendar(2023, [date(2023, 5, 26)])
+
+    # Then weekends and the non working date are not work days
+    assert given_calendar.is_work_day(date(2023, 5, 25))
+    assert not given_calendar.is_work_day(date(2023, 5, 26))
+    assert not given_calendar.is_work_day(date(2023, 5, 27))
+
+    # And the next and previous work dates skip them
+    assert given_calendar.next_work_date(date(2023, 5, 26)) == date(2023, 5, 29)
+    assert given_calendar.previous_work_date(date(2023, 5, 28)) == date(2023, 5, 25)
+
+    # And there are no work dates outside the year
+    assert given_calendar.next_work_date(date(2023, 12, 30)) is None
+    assert given_calendar.previous_work_date(date(2022, 12, 31)) is None
+
+
+def test_work_calendar_counts_work_days_between_dates():
+    # Given a calendar for a year
+    given_calendar = WorkCalendar(2023)
+
+    # When adding a non working date in a week
+    given_calendar.add_non_working_date(date(2023, 5, 1))
+
+    # Then the work days and expected hours of the week are reduced
+    monday, sunday = date(2023, 5, 1), date(2023, 5, 7)
+    assert given_calendar.work_days_between(monday, sunday) == 4
+    assert given_calendar.expected_hours(monday, sunday) == timedelta(hours=32)
+    assert given_calendar.work_days_between(sunday, monday) == 0
+    assert given_calendar.work_days_between(date(2023, 1, 1), date(2023, 12, 31)) == 259
+
+
+def test_work_calendar_is_not_rebuilt_for_known_non_working_dates():
+    # Given a calendar with a non working date, with its work days built
+    given_calendar = WorkCalendar(2023, [date(2023, 5, 1)])
+    ordinals = given_calendar.ordinals
+
+    # When adding the same non working date again
+    given_calendar.add_non_working_date(date(2023, 5, 1))
+
+    # Then the work days are kept
+    assert given_calendar.ordinals is ordinals
+
+    # But a new non working date rebuilds them
+    given_calendar.add_non_working_date(date(2023, 5, 2))
+    assert given_calendar.ordinals is not ordinals
+    assert not given_calendar.is_work_day(date(2023, 5, 2))
+
+
+def test_work_calendar_rejects_dates_outside_year():
+    # Given a calendar for a year
+    given_calendar = WorkCalendar(2023)
+
+    # When adding a non working date in another year
+    # Then an exception is raised
+    with pytest.raises(DateInconsistencyError):
+        given_calendar.add_non_working_date(date(2024, 1, 1))
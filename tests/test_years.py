@@ -0,0 +1,49 @@
+from datetime import date
+
+from heath.ledger import Ledger
+from heath.project import Project
+from heath.years import YearsReport
+
+
+def given_ledger_with_years(*years: int) -> Ledger:
+    given_ledger = Ledger()
+    given_ledger.add_project(Project("P1"))
+    given_ledger.add_project(Project("Vacation", all_day=True))
+    for year in years:
+        given_ledger.parse_month(
+            year, 3, "1. P1 8:00 - 17:00, Lunch 1:00\n2. Vacation\n3. P1 9:00 - 16:00"
+        )
+    return given_ledger
+
+
+def test_years_report_has_a_row_per_year_and_a_total():
+    # Given a ledger with months in some years
+    given_ledger = given_ledger_with_years(2021, 2023)
+    assert given_ledger.years == [2021, 2023]
+
+    # When reporting the years
+    total = given_ledger.get_custom_time_period(date(2021, 1, 1), date(2023, 12, 31))
+    total.title = "Totalt"
+    years_report = YearsReport(
+        [given_ledger.get_year(year) for year in given_ledger.years], total
+    )
+    report = years_report.report()
+
+    # Then each year and the total has a row
+    assert "2021 - 2023" in report.splitlines()[1]
+    assert [line.split() for line in report.splitlines()[5:8]] == [
+        ["2021", "15:00", "-1:00"],
+        ["2023", "15:00", "-1:00"],
+        ["Totalt", "30:00", "-2:00"],
+    ]
+
+    # And the projects of each year and in total
+    project_lines = years_report.project_report().splitlines()[5:-1]
+    assert [line.split() for line in project_lines] == [
+        ["2021", "P1", "15:00"],
+        ["Vacation", "1", "d"],
+        ["2023", "P1", "15:00"],
+        ["Vacation", "1", "d"],
+        ["Totalt", "P1", "30:00"],
+        ["Vacation", "2", "d"],
+    ]
@@ -1,6 +1,8 @@
 import datetime
+from typing import Iterable
 
 from heath.day import Day
+from heath.ledger import Ledger
 from heath.month import Month
 from heath.project import Project
 from heath.shift import Shift
@@ -47,3 +49,47 @@ def given_all_day_project_on_date(
     new_day = Day(day_date)
     new_day.add_shift(Shift(all_day_project, day_date))
     return new_day
+
+
+def given_day_string(day_number: int, project: str = "P1") -> str:
+    # Shifts before and after lunch that vary with the day number, and
+    # vacation every tenth day.
+    if day_number % 10 == 0:
+        return f"{day_number}. Vacation"
+    start = f"{7 + day_number % 3}:{day_number % 4 * 15:02}"
+    stop = f"{15 + day_number % 2}:00"
+    lunch = f"0:{day_number % 5}5"
+    return f"{day_number}. {project} {start} - 12:00; P1 12:30 - {stop}, Lunch {lunch}"
+
+
+def given_month_string(
+    ledger: Ledger, year: int, month: int, project_count: int = 1
+) -> str:
+    work_dates = ledger.work_calendar(year).work_dates_between(
+        datetime.date(year, month, 1), datetime.date(year, month, 28)
+    )
+    return "\n".join(
+        given_day_string(
+            work_date.day, f"P{(work_date.day + month) % project_count + 1}"
+        )
+        for work_date in work_dates
+    )
+
+
+def given_ledger_with_projects(project_count: int = 1) -> Ledger:
+    given_ledger = Ledger()
+    for project_number in range(1, project_count + 1):
+        given_ledger.add_project(Project(f"P{project_number}"))
+    given_ledger.add_project(Project("Vacation", all_day=True))
+    return given_ledger
+
+
+def given_ledger_with_months(
+    year: int, months: Iterable[int], project_count: int = 1
+) -> Ledger:
+    given_ledger = given_ledger_with_projects(project_count)
+    for month in months:
+        given_ledger.parse_month(
+            year, month, given_month_string(given_ledger, year, month, project_count)
+        )
+    return given_ledger